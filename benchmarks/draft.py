@@ -0,0 +1,135 @@
+"""
+Draft vs. full extraction on real scopes.
+
+Runs pdf_table_processor in both modes on each PDF, reports the time of
+each and a row-level diff of the draft rows against the full ones, and can
+write the differing rows to CSV for review. PDF parsing is shared by both
+modes and dominates the end-to-end time, so the table-read stage is also
+timed on its own with every page already parsed.
+
+    python -m benchmarks.draft --diff-csv export/draft_diff.csv
+"""
+from argparse import ArgumentParser
+from difflib import SequenceMatcher
+from glob import glob
+from logging import disable, WARNING
+from time import perf_counter
+
+from pandas import DataFrame
+from pdfplumber import open as pdfopen
+
+from src.extract import CellTextAssembler, custom_extract_tables
+from src.main import pdf_table_processor
+
+ROW_COLUMNS = ["Equipment", "Parameter", "Range", "Frequency", "CMC (±)", "Comments"]
+DEFAULT_PDFS = sorted(glob("tests/test_data/*.pdf"))
+
+
+def row_diff(full, draft, columns=ROW_COLUMNS):
+    """
+    Align the draft rows to the full rows and list the differences.
+
+    Returns:
+        tuple: ({"full_rows", "draft_rows", "matching_rows", "column_matches"},
+            [(tag, row), ...]) where tag is "-" for a full row the draft
+            lacks and "+" for a draft row the full mode lacks.
+            column_matches counts, per column, the replaced rows whose value
+            still agrees.
+    """
+    a = list(full[columns].itertuples(index=False, name=None))
+    b = list(draft[columns].itertuples(index=False, name=None))
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    diff = []
+    column_matches = dict.fromkeys(columns, 0)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for column in columns:
+                column_matches[column] += i2 - i1
+            continue
+        if tag == "replace":
+            for full_row, draft_row in zip(a[i1:i2], b[j1:j2]):
+                for column, x, y in zip(columns, full_row, draft_row):
+                    column_matches[column] += x == y
+        diff.extend(("-", row) for row in a[i1:i2])
+        diff.extend(("+", row) for row in b[j1:j2])
+    summary = {
+        "full_rows": len(a),
+        "draft_rows": len(b),
+        "matching_rows": sum(block.size for block in matcher.get_matching_blocks()),
+        "column_matches": column_matches,
+    }
+    return summary, diff
+
+
+def time_table_read(pdf_path):
+    """Time custom_extract_tables in each mode over already-parsed pages.
+
+    Returns:
+        dict: {"full": seconds, "draft": seconds}
+    """
+    assembler = CellTextAssembler()
+    timings = {}
+    with pdfopen(pdf_path) as pdf:
+        for page in pdf.pages:
+            page.objects
+        for mode in ("full", "draft"):
+            start = perf_counter()
+            for page in pdf.pages:
+                custom_extract_tables(page, assembler=assembler, draft=mode == "draft")
+            timings[mode] = perf_counter() - start
+    return timings
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "pdfs", nargs="*", default=DEFAULT_PDFS,
+        help="Scope PDFs to compare (default: tests/test_data/*.pdf)",
+    )
+    parser.add_argument("--diff-csv", help="Write the differing rows to this CSV")
+    args = parser.parse_args(argv)
+
+    disable(WARNING)
+    records = []
+    for pdf_path in args.pdfs:
+        timings = {}
+        results = {}
+        for mode in ("full", "draft"):
+            start = perf_counter()
+            results[mode] = pdf_table_processor(pdf_path, draft=mode == "draft")
+            timings[mode] = perf_counter() - start
+        summary, diff = row_diff(results["full"], results["draft"])
+        read = time_table_read(pdf_path)
+        print(
+            f"{pdf_path}: full {timings['full']:.2f}s, draft {timings['draft']:.2f}s "
+            f"({timings['full'] / timings['draft']:.1f}x); table read "
+            f"{read['full']:.2f}s vs {read['draft']:.2f}s "
+            f"({read['full'] / read['draft']:.1f}x)"
+        )
+        print(
+            f"  {summary['matching_rows']}/{summary['full_rows']} full rows reproduced "
+            f"exactly, {summary['draft_rows']} draft rows"
+        )
+        n = summary["full_rows"] or 1
+        print(
+            "  per column: "
+            + ", ".join(
+                f"{column} {100 * matches / n:.0f}%"
+                for column, matches in summary["column_matches"].items()
+            )
+        )
+        records.extend(
+            {"pdf": pdf_path, "diff": tag, **dict(zip(ROW_COLUMNS, row))}
+            for tag, row in diff
+        )
+
+    if args.diff_csv:
+        DataFrame(records, columns=["pdf", "diff"] + ROW_COLUMNS).to_csv(
+            args.diff_csv, index=False, encoding="utf-8-sig"
+        )
+        print(f"Wrote {len(records)} differing rows to '{args.diff_csv}'")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
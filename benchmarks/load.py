@@ -0,0 +1,95 @@
+"""
+Load driver for the table-parsing pipeline.
+
+Generates synthetic scopes of increasing size and times each stage, then
+reports the growth exponent between successive sizes so super-linear stages
+stand out (an exponent near 1.0 is linear, near 2.0 is quadratic).
+
+    python -m benchmarks.load --rows 10000 100000 1000000
+"""
+from argparse import ArgumentParser
+from logging import disable, WARNING
+from math import log
+from time import perf_counter
+
+from benchmarks.synthetic import generate_pages
+from src.main import custom_parse_table, parse_table_rows, restructure_input_data
+
+STAGES = ["restructure_input_data", "custom_parse_table", "parse_table_rows"]
+
+
+def run_stages(pages):
+    """Time each pipeline stage over the given pages.
+
+    Returns:
+        tuple: ({stage: seconds}, row_count)
+    """
+    timings = {}
+    tables = [table for page in pages for table in page]
+
+    start = perf_counter()
+    for table in tables:
+        restructure_input_data(table)
+    timings["restructure_input_data"] = perf_counter() - start
+
+    start = perf_counter()
+    table_rows = []
+    for table in tables:
+        table_rows.extend(custom_parse_table(table))
+    timings["custom_parse_table"] = perf_counter() - start
+
+    start = perf_counter()
+    df = parse_table_rows(table_rows)
+    timings["parse_table_rows"] = perf_counter() - start
+    return timings, len(df)
+
+
+def growth_exponent(n1, t1, n2, t2):
+    """Exponent k such that t grows like n**k between two sizes."""
+    if t1 <= 0 or t2 <= 0 or n1 == n2:
+        return float("nan")
+    return log(t2 / t1) / log(n2 / n1)
+
+
+def main(argv=None):
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000],
+        help="Output row counts to generate (default: 10000 100000)",
+    )
+    parser.add_argument(
+        "--rows-per-table", type=int, default=50,
+        help="Rows per synthetic table; raise it to stress a single table",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--threshold", type=float, default=1.2,
+        help="Flag stages whose growth exponent exceeds this (default: 1.2)",
+    )
+    args = parser.parse_args(argv)
+
+    disable(WARNING)
+    results = []
+    for n in sorted(args.rows):
+        pages, expected = generate_pages(n, args.rows_per_table, seed=args.seed)
+        timings, rows = run_stages(pages)
+        if rows != expected:
+            raise AssertionError(f"Expected {expected} rows, pipeline produced {rows}")
+        results.append((n, timings))
+        cells = "  ".join(f"{s}={timings[s]:.3f}s" for s in STAGES)
+        print(f"{n:>9} rows  {cells}")
+
+    exit_code = 0
+    for (n1, t1), (n2, t2) in zip(results, results[1:]):
+        for stage in STAGES:
+            k = growth_exponent(n1, t1[stage], n2, t2[stage])
+            flag = ""
+            if k > args.threshold:
+                flag = "  <-- super-linear"
+                exit_code = 1
+            print(f"{stage:>24} {n1} -> {n2}: n^{k:.2f}{flag}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,249 @@
+"""
+Synthetic scope tables at the `custom_extract_tables` JSON level.
+
+The tables mimic `tests/test_data/pages/*.json`: a header row followed by
+visual rows of four cells, each cell a list of {"text", "top"} items. Both
+header types are produced, along with "(cont)" continuation rows,
+"Equipment –" group headings with tab-indented parameters and comments,
+hardness-scale sub-headings, "Label:" sub-headings and subscripted units.
+"""
+from random import Random
+
+LINE_HEIGHT = 11.7
+BLOCK_GAP = 23.4
+
+EQUIPMENT_HEADERS = ["Parameter/Equipment", "Range", "CMC (±)", "Comments"]
+RANGE_HEADERS = ["Parameter/Range", "Frequency", "CMC (±)", "Comments"]
+
+EQUIPMENT = [
+    "Micrometers",
+    "Thread Plug Gages",
+    "Calipers",
+    "Height Gages",
+    "Gage Blocks",
+    "Torque Wrenches",
+    "Pressure Gages",
+    "Indicators",
+    "Ring Gages",
+    "Thermometers",
+]
+PARAMETERS = [
+    "Measure",
+    "Generate",
+    "Pitch Diameter",
+    "Major Diameter",
+    "Length Measurement Error (Eₗ)",
+    "Repeatability (R₀)",
+    "Flatness",
+    "Parallelism",
+]
+ELECTRICAL = ["DC Voltage", "AC Voltage", "DC Current", "AC Current", "Resistance"]
+COMMENTS = [
+    "Gage blocks",
+    "Ring gages",
+    "Laser system",
+    "Fluke 5502A",
+    "HP 3458A",
+    "Deadweight tester",
+    "PRT, Fluke 1502A",
+]
+LENGTH_UNITS = ["in", "mm", "µin", "ft"]
+PRESSURE_UNITS = ["psi", "in·H₂O", "kPa"]
+ELECTRICAL_UNITS = ["mV", "V", "mA", "A", "Ω"]
+FREQUENCY_UNITS = ["Hz", "kHz", "MHz"]
+HARDNESS_SCALES = ["HRA", "HRC", "HR15N", "HR30TW"]
+
+
+def _cell(*items):
+    return [{"text": text, "top": top} for text, top in items]
+
+
+def _header_row(headers, top):
+    return [_cell((text, top)) for text in headers]
+
+
+class _Writer:
+    """Accumulates visual rows and tracks how many output rows they produce."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.top = 0.0
+        self.rows = []
+        self.expected_rows = 0
+
+    def line(self):
+        top = self.top
+        self.top += LINE_HEIGHT
+        return top
+
+    def gap(self):
+        self.top += BLOCK_GAP
+
+    def number(self, low, high):
+        value = self.rng.uniform(low, high)
+        return f"{value:.2g}" if value < 10 else f"{value:.0f}"
+
+    def range_text(self, units):
+        unit = self.rng.choice(units)
+        low = self.rng.randint(0, 50)
+        kind = self.rng.random()
+        if kind < 0.2:
+            return f"Up to {self.rng.randint(1, 600)} {unit}"
+        if kind < 0.3:
+            return f"> {low} {unit}"
+        return f"({low} to {low + self.rng.randint(1, 1000)}) {unit}"
+
+    def cmc_text(self, unit):
+        kind = self.rng.random()
+        if kind < 0.4:
+            return f"({self.number(1, 500)} + {self.number(0.1, 20)}L) µin"
+        if kind < 0.7:
+            return f"{self.number(0.001, 5)} % + {self.number(0.1, 100)} {unit}"
+        if kind < 0.85:
+            return f"{self.number(0.01, 2)} % rdg"
+        return f"{self.number(0.001, 500)} {unit}"
+
+
+def _equipment_block(w, n, continued):
+    """A 'Parameter/Equipment' visual row with up to n output rows."""
+    rng = w.rng
+    col0, col1, col2, col3 = [], [], [], []
+    kind = rng.random()
+    name = rng.choice(EQUIPMENT)
+    if kind < 0.3 and rng.random() < 0.5:
+        name = f"{name} – {rng.choice(PARAMETERS)}"
+    if continued:
+        name += " (cont)"
+    if kind < 0.3:
+        # Plain equipment, or "Equipment – Parameter", with one row per range.
+        top = w.line()
+        col0.append((name, top))
+        col3.append((rng.choice(COMMENTS), top))
+        for i in range(n):
+            unit = rng.choice(LENGTH_UNITS + PRESSURE_UNITS)
+            col1.append((w.range_text([unit]), top))
+            col2.append((w.cmc_text(unit), top))
+            top = w.line()
+    elif kind < 0.6:
+        # "Equipment –" heading followed by tab-indented parameters.
+        top = w.line()
+        col0.append((f"{name} –", top))
+        col3.append((rng.choice(COMMENTS), top))
+        for i in range(n):
+            top = w.line()
+            unit = rng.choice(LENGTH_UNITS)
+            col0.append(("\t" + rng.choice(PARAMETERS), top))
+            col1.append((w.range_text([unit]), top))
+            col2.append((w.cmc_text(unit), top))
+            col3.append(("\t" + rng.choice(COMMENTS), top))
+    elif kind < 0.8:
+        # Hardness scales: "HRC" then tab-indented Low/Medium/High rows.
+        top = w.line()
+        col0.append((name, top))
+        col3.append((rng.choice(COMMENTS), top))
+        emitted = 0
+        while emitted < n:
+            scale = rng.choice(HARDNESS_SCALES)
+            col1.append((scale, top))
+            for level in ("Low", "Medium", "High")[: n - emitted]:
+                top = w.line()
+                col1.append((f"\t{level}", top))
+                col2.append((f"{w.number(0.1, 2)} {scale}", top))
+                emitted += 1
+            top = w.line()
+    else:
+        # "Label:" sub-headings under a tab-indented parameter.
+        top = w.line()
+        col0.append((f"{name} –", top))
+        top = w.line()
+        col0.append(("\t" + rng.choice(PARAMETERS), top))
+        emitted = 0
+        while emitted < n:
+            col1.append((rng.choice(["Repeatability:", "Error:"]), top))
+            top = w.line()
+            unit = rng.choice(PRESSURE_UNITS)
+            col1.append((w.range_text([unit]), top))
+            col2.append((w.cmc_text(unit), top))
+            col3.append((rng.choice(COMMENTS), top))
+            emitted += 1
+            top = w.line()
+    w.expected_rows += n
+    w.rows.append([_cell(*col0), _cell(*col1), _cell(*col2), _cell(*col3)])
+    w.gap()
+
+
+def _range_block(w, n, continued):
+    """A 'Parameter/Range' visual row with up to n output rows."""
+    rng = w.rng
+    col0, col1, col2, col3 = [], [], [], []
+    unit = rng.choice(ELECTRICAL_UNITS)
+    name = f"{rng.choice(ELECTRICAL)} – {rng.choice(['Measure', 'Generate'])}"
+    if continued:
+        name += " (cont)"
+    top = w.line()
+    col0.append((name, top))
+    emitted = 0
+    while emitted < n:
+        top = w.line()
+        col0.append(("\t" + w.range_text([unit]), top))
+        col3.append((rng.choice(COMMENTS), top))
+        for i in range(min(rng.randint(1, 4), n - emitted)):
+            col1.append((w.range_text(FREQUENCY_UNITS), top))
+            col2.append((w.cmc_text(unit), top))
+            emitted += 1
+            top = w.line()
+    w.expected_rows += n
+    w.rows.append([_cell(*col0), _cell(*col1), _cell(*col2), _cell(*col3)])
+    w.gap()
+
+
+def generate_table(n_rows, header="Parameter/Equipment", seed=0, block_rows=8):
+    """
+    Build one synthetic table that custom_parse_table turns into n_rows rows.
+
+    Args:
+        n_rows (int): Number of output rows the table should produce.
+        header (str, optional): "Parameter/Equipment" or "Parameter/Range".
+        seed (int, optional): Seed for reproducible tables. Defaults to 0.
+        block_rows (int, optional): Maximum output rows per visual row.
+
+    Returns:
+        tuple: (table, expected_rows)
+    """
+    if header == "Parameter/Equipment":
+        headers, block = EQUIPMENT_HEADERS, _equipment_block
+    elif header == "Parameter/Range":
+        headers, block = RANGE_HEADERS, _range_block
+    else:
+        raise ValueError(f"Unsupported header '{header}'")
+    w = _Writer(Random(seed))
+    w.rows.append(_header_row(headers, w.line()))
+    w.gap()
+    continued = True
+    while w.expected_rows < n_rows:
+        n = min(w.rng.randint(1, block_rows), n_rows - w.expected_rows)
+        block(w, n, continued)
+        continued = False
+    return w.rows, w.expected_rows
+
+
+def generate_pages(n_rows, rows_per_page=50, seed=0):
+    """
+    Build a list of pages (each a list of tables, as returned by
+    custom_extract_tables) that together produce n_rows rows, alternating
+    between both header types.
+
+    Returns:
+        tuple: (pages, expected_rows)
+    """
+    pages = []
+    expected = 0
+    page_number = 0
+    while expected < n_rows:
+        header = RANGE_HEADERS[0] if page_number % 4 == 3 else EQUIPMENT_HEADERS[0]
+        n = min(rows_per_page, n_rows - expected)
+        table, rows = generate_table(n, header, seed=seed + page_number)
+        pages.append([table])
+        expected += rows
+        page_number += 1
+    return pages, expected
@@ -1,7 +1,10 @@
 from re import match as re_match, search
+from typing import Any, Iterable, List, Optional, Tuple
 
 
-class budget(dict):
+class budget:
+    __slots__ = ("base", "multiplier", "mult_unit", "uncertainty_unit")
+
     base: float
     multiplier: float
     mult_unit: str
@@ -27,12 +30,18 @@ class budget(dict):
             ]
         )
 
+    __hash__ = None
+
     def __repr__(s):
         return (
             f"budget({s.base!r}, {s.multiplier!r}, "
             f"{s.mult_unit!r}, {s.uncertainty_unit!r})"
         )
 
+    # Allow tuple unpacking (i.e. base, mult, unit, unc = budget_instance)
+    def __iter__(s):
+        return iter((s.base, s.multiplier, s.mult_unit, s.uncertainty_unit))
+
     # Add method to allow list coercion (i.e. list(budget_instance))
     def __list__(s):
         return [s.base, s.multiplier, s.mult_unit, s.uncertainty_unit]
@@ -79,10 +88,14 @@ def parse_budget(input_text: str) -> budget:
     Returns:
         budget: (base, multiplier, mult_unit, uncertainty_unit)
     """
+    return budget(*_parse_budget_fields(input_text))
+
+
+def _parse_budget_fields(input_text: str) -> tuple:
     text = input_text.strip()
     # Handle placeholders.
     if text == "---" or not text:
-        return budget(None, None, None, None)
+        return (None, None, None, None)
 
     # If there's a plus sign, we assume a two-part expression.
     if "+" in text:
@@ -94,7 +107,7 @@ def parse_budget(input_text: str) -> budget:
             outer = text[closing_index + 1:].strip()  # uncertainty unit
             if (closing_index == -1) or ("+" not in inner):
                 # Malformed; fall through to generic handling
-                return budget(text, None, None, None)
+                return (text, None, None, None)
             left_inner, right_inner = inner.split("+", 1)
             left_inner = left_inner.strip()
             right_inner = right_inner.strip()
@@ -103,11 +116,11 @@ def parse_budget(input_text: str) -> budget:
             # If the base part had an attached unit, use it;
             # otherwise, fall back to the multiplier part’s attached unit.
             if left_unit:
-                return budget(right_val, left_unit, left_unit, outer)
+                return (right_val, left_unit, left_unit, outer)
             elif right_unit:
-                return budget(left_val, right_val, right_unit, outer)
+                return (left_val, right_val, right_unit, outer)
             # Malformed; fall through to generic handling
-            return budget(text, None, None, None)
+            return (text, None, None, None)
         else:
             # Case 2: No parentheses; expect format like "0.034 % + 3.6 µV" or "1.3 % rdg + 120 µF"
             left, right = text.split("+", 1)
@@ -116,7 +129,7 @@ def parse_budget(input_text: str) -> budget:
             mult_val, left_unit = parse_num_unit(left, force_float=True)
             base_val, right_unit = parse_num_unit(right, force_float=True)
             # In this format, the left part’s unit is taken as the multiplier conversion unit.
-            return budget(
+            return (
                 base_val, mult_val, left_unit if left_unit else "", right_unit
             )
     else:
@@ -124,15 +137,46 @@ def parse_budget(input_text: str) -> budget:
             pattern = r"([+-]?\d+(?:\.\d+)?)(?=\s*% rdg)"
             if match := search(pattern, text):
                 mult_val = float(match.group(1))
-                return budget(0, mult_val, "% rdg", None)
+                return (0, mult_val, "% rdg", None)
             else:
                 base_val, rest = parse_num_unit(text, force_float=True)
-                return budget(base_val, 0, None, rest)
+                return (base_val, 0, None, rest)
         # No plus sign. Expect format: "<number> <uncertainty_unit>"
         # Split on first whitespace.
         if parts := text.split(maxsplit=1):
             base_str = parts[0]
             rest = parts[1] if len(parts) > 1 else ""
             base_val, _ = parse_num_unit(base_str, force_float=False)
-            return budget(base_val, 0, None, rest.strip())
-        return budget(text, None, None, None)
+            return (base_val, 0, None, rest.strip())
+        return (text, None, None, None)
+
+
+def parse_budget_columns(
+    texts: Iterable[str],
+) -> Tuple[List[Any], List[Any], List[Optional[str]], List[Optional[str]]]:
+    """
+    Parse a whole CMC (±) column at once into four parallel column lists.
+
+    This skips the per-row budget (and pd.Series) allocation when the results
+    are only going to be written straight back into DataFrame columns.
+
+    The lists are left untyped: bases mix int, float, str and None (whatever
+    parse_budget produces), multipliers are usually float or None but hold the
+    unit string when it comes first ("(2.3D + 36) µin" gives "D"), and any
+    unit can be None. parse_table_rows stores them as object columns so the
+    CSV output matches the row-wise parse.
+
+    Args:
+        texts (Iterable[str]): The CMC (±) cell texts.
+
+    Returns:
+        tuple: (bases, multipliers, mult_units, uncertainty_units)
+    """
+    bases, multipliers, mult_units, uncertainty_units = [], [], [], []
+    for text in texts:
+        base, multiplier, mult_unit, uncertainty_unit = _parse_budget_fields(text)
+        bases.append(base)
+        multipliers.append(multiplier)
+        mult_units.append(mult_unit)
+        uncertainty_units.append(uncertainty_unit)
+    return bases, multipliers, mult_units, uncertainty_units
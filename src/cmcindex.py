@@ -0,0 +1,428 @@
+"""
+Compact, memory-mappable binary index of parsed CMC rows.
+
+write_cmc_index() turns pdf_table_processor output into a single file that
+CmcIndex opens with mmap, so lookups need no CSV parsing and processes
+reading the same file share the OS page cache.
+
+File layout (native little-endian, every section 8-byte aligned):
+
+    header     MAGIC, VERSION, entry/group/string counts, section offsets
+    entries    float64 columns ENTRY_FLOATS, uint32 columns ENTRY_INTS
+    groups     uint32 columns GROUP_INTS, sorted by (equipment, parameter, unit)
+    strings    uint32 offsets[n_strings + 1] into a UTF-8 blob
+
+CmcLookup puts an LRU cache in front of CmcIndex for front ends that ask
+the same questions repeatedly, and reopens the file when a new revision is
+loaded or replaces it.
+
+Entries are grouped by (Equipment, Parameter, range unit) and sorted by
+range_min within their group. A row whose range has different min and max
+units ("100 mA to 1 A") gets one entry per unit, each open on the other
+side. Bounds that are missing or not numeric are stored as -inf/+inf, and
+budget coefficients that are not numeric as NaN.
+"""
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from math import inf, isnan, nan
+from mmap import ACCESS_READ, mmap
+from os import chmod, fdopen, path as os_path, remove, replace, stat, umask
+from struct import calcsize, pack, unpack_from
+import sys
+from tempfile import mkstemp
+
+MAGIC = b"CMCIDX\0\0"
+VERSION = 1
+NONE_ID = 0xFFFFFFFF
+
+ENTRY_FLOATS = ("range_min", "range_max", "cmc_base", "cmc_multiplier")
+ENTRY_INTS = ("row", "mult_unit", "uncertainty_unit", "range", "cmc")
+GROUP_INTS = ("equipment", "parameter", "unit", "start", "count")
+SECTIONS = ENTRY_FLOATS + ENTRY_INTS + GROUP_INTS + ("string_offsets", "string_blob")
+
+# pdf_table_processor columns the index is built from.
+COLUMNS = (
+    "Equipment",
+    "Parameter",
+    "Range",
+    "CMC (±)",
+    "range_min",
+    "range_min_unit",
+    "range_max",
+    "range_max_unit",
+    "cmc_base",
+    "cmc_multiplier",
+    "cmc_mult_unit",
+    "cmc_uncertainty_unit",
+)
+
+HEADER_FORMAT = f"<8sIIII{len(SECTIONS)}Q"
+HEADER_SIZE = calcsize(HEADER_FORMAT)
+
+
+def _to_float(value, missing):
+    if value is None:
+        return missing
+    if isinstance(value, (int, float)):
+        return missing if isnan(value) else float(value)
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return missing
+
+
+def _range_entries(range_min, min_unit, range_max, max_unit):
+    """Yield (unit, range_min, range_max) for one parsed row."""
+    low = _to_float(range_min, -inf)
+    high = _to_float(range_max, inf)
+    if min_unit is None or max_unit is None or min_unit == max_unit:
+        yield (max_unit if max_unit is not None else min_unit or ""), low, high
+    else:
+        yield min_unit, low, inf
+        yield max_unit, -inf, high
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, value):
+        if value is None or (isinstance(value, float) and isnan(value)):
+            return NONE_ID
+        value = str(value)
+        if value not in self.ids:
+            self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return self.ids[value]
+
+
+def _file_mode(path):
+    """Mode for a new index at path: the existing file's, else 0o666 minus umask."""
+    try:
+        return stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mask = umask(0)
+        umask(mask)
+        return 0o666 & ~mask
+
+
+def write_cmc_index(df, path):
+    """
+    Write the rows of a pdf_table_processor DataFrame to a binary CMC index.
+
+    The index is written to a temporary file next to path and then moved into
+    place with os.replace(), so a reader never maps a half-written file and
+    processes that already have the old file mapped keep a consistent view.
+    Windows refuses the replace while any process has path mapped; write a
+    new revision to a new path there (see CmcLookup.load()).
+
+    Args:
+        df (DataFrame): Parsed scope rows.
+        path (str): Where to write the index.
+    """
+    if sys.byteorder != "little":
+        raise OSError("CMC index files are little-endian only")
+    strings = _StringTable()
+    entries = []
+    rows = df[list(COLUMNS)].itertuples(index=False, name=None)
+    for i, row in enumerate(rows):
+        equipment, parameter = row[0], row[1]
+        for unit, low, high in _range_entries(*row[4:8]):
+            key = (str(equipment or ""), str(parameter or ""), str(unit))
+            entries.append((key, low, high, i, row))
+    entries.sort(key=lambda e: (e[0], e[1], e[3]))
+
+    floats = {name: array("d") for name in ENTRY_FLOATS}
+    ints = {name: array("I") for name in ENTRY_INTS}
+    groups = {name: array("I") for name in GROUP_INTS}
+    for n, (key, low, high, i, row) in enumerate(entries):
+        range_text, cmc_text = row[2], row[3]
+        base, multiplier, mult_unit, uncertainty_unit = row[8:12]
+        if not groups["start"] or key != entries[n - 1][0]:
+            for name, value in zip(GROUP_INTS[:3], key):
+                groups[name].append(strings.intern(value))
+            groups["start"].append(n)
+            groups["count"].append(0)
+        groups["count"][-1] += 1
+        floats["range_min"].append(low)
+        floats["range_max"].append(high)
+        floats["cmc_base"].append(_to_float(base, nan))
+        floats["cmc_multiplier"].append(_to_float(multiplier, nan))
+        ints["row"].append(i)
+        ints["mult_unit"].append(strings.intern(mult_unit))
+        ints["uncertainty_unit"].append(strings.intern(uncertainty_unit))
+        ints["range"].append(strings.intern(range_text))
+        ints["cmc"].append(strings.intern(cmc_text))
+
+    blob = bytearray()
+    string_offsets = array("I", [0])
+    for value in strings.strings:
+        blob += value.encode("utf-8")
+        string_offsets.append(len(blob))
+
+    sections = (
+        [floats[name].tobytes() for name in ENTRY_FLOATS]
+        + [ints[name].tobytes() for name in ENTRY_INTS]
+        + [groups[name].tobytes() for name in GROUP_INTS]
+        + [string_offsets.tobytes(), bytes(blob)]
+    )
+    offsets = []
+    position = HEADER_SIZE
+    for data in sections:
+        position += -position % 8
+        offsets.append(position)
+        position += len(data)
+
+    directory, name = os_path.split(os_path.abspath(path))
+    fd, temp_path = mkstemp(prefix=f"{name}.", suffix=".tmp", dir=directory)
+    try:
+        with fdopen(fd, "wb") as f:
+            f.write(
+                pack(
+                    HEADER_FORMAT,
+                    MAGIC,
+                    VERSION,
+                    len(entries),
+                    len(groups["start"]),
+                    len(strings.strings),
+                    *offsets,
+                )
+            )
+            for offset, data in zip(offsets, sections):
+                f.write(b"\0" * (offset - f.tell()))
+                f.write(data)
+        # mkstemp creates the file owner-only; give it the mode a plain open()
+        # would, or keep the mode of the index it replaces.
+        chmod(temp_path, _file_mode(path))
+        replace(temp_path, path)
+    except BaseException:
+        remove(temp_path)
+        raise
+
+
+class CmcIndex:
+    """
+    Read-only view of a file written by write_cmc_index.
+
+    Nothing is parsed on open: the file is memory-mapped and each column is a
+    typed memoryview over the mapping.
+    """
+
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise OSError("CMC index files are little-endian only")
+        with open(path, "rb") as f:
+            self._mmap = mmap(f.fileno(), 0, access=ACCESS_READ)
+        magic, version, n_entries, n_groups, n_strings, *offsets = unpack_from(
+            HEADER_FORMAT, self._mmap
+        )
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"'{path}' is not a version {VERSION} CMC index")
+        self._buffer = memoryview(self._mmap)
+        self._views = []
+        sizes = (
+            [(n_entries, "d")] * len(ENTRY_FLOATS)
+            + [(n_entries, "I")] * len(ENTRY_INTS)
+            + [(n_groups, "I")] * len(GROUP_INTS)
+            + [(n_strings + 1, "I")]
+        )
+        for name, offset, (count, fmt) in zip(SECTIONS, offsets, sizes):
+            view = self._buffer[offset:offset + count * calcsize(fmt)].cast(fmt)
+            self._views.append(view)
+            setattr(self, f"_{name}", view)
+        blob_start = offsets[-1]
+        self._string_blob = self._buffer[blob_start:blob_start + self._string_offsets[-1]]
+        self._views.append(self._string_blob)
+        self.n_entries = n_entries
+        self.n_groups = n_groups
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def string(self, string_id):
+        if string_id == NONE_ID:
+            return None
+        start = self._string_offsets[string_id]
+        end = self._string_offsets[string_id + 1]
+        return str(self._string_blob[start:end], "utf-8")
+
+    def _group_key(self, g):
+        return (
+            self.string(self._equipment[g]),
+            self.string(self._parameter[g]),
+            self.string(self._unit[g]),
+        )
+
+    def _find_group(self, key):
+        low, high = 0, self.n_groups
+        while low < high:
+            mid = (low + high) // 2
+            if self._group_key(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.n_groups and self._group_key(low) == key:
+            return low
+        return None
+
+    def lookup(self, equipment, parameter, value, unit):
+        """
+        Find the CMC entries whose range covers value in the given unit.
+
+        Returns:
+            list: [{"row", "range", "cmc", "cmc_base", "cmc_multiplier",
+            "cmc_mult_unit", "cmc_uncertainty_unit"}, ...] in range order,
+            where "row" is the row number in the DataFrame the index was
+            written from.
+        """
+        g = self._find_group((equipment or "", parameter or "", unit or ""))
+        if g is None:
+            return []
+        start = self._start[g]
+        end = start + self._count[g]
+        stop = bisect_right(self._range_min, value, start, end)
+        results = []
+        for i in range(start, stop):
+            if self._range_max[i] >= value:
+                results.append(
+                    {
+                        "row": self._row[i],
+                        "range": self.string(self._range[i]),
+                        "cmc": self.string(self._cmc[i]),
+                        "cmc_base": self._cmc_base[i],
+                        "cmc_multiplier": self._cmc_multiplier[i],
+                        "cmc_mult_unit": self.string(self._mult_unit[i]),
+                        "cmc_uncertainty_unit": self.string(self._uncertainty_unit[i]),
+                    }
+                )
+        return results
+
+
+def evaluate_cmc(entry, value, unit):
+    """
+    Evaluate a looked-up CMC budget at value, where that is possible without
+    unit conversion.
+
+    The budget is base + multiplier * value when the multiplier is per unit of
+    the measured quantity (cmc_mult_unit == unit, e.g. the D/L/W terms), and
+    base + multiplier / 100 * value for "%"/"% rdg" budgets whose uncertainty
+    unit is the measured unit.
+
+    Returns:
+        float: The CMC in entry["cmc_uncertainty_unit"], or None if the budget
+        cannot be evaluated this way.
+    """
+    base = entry["cmc_base"]
+    multiplier = entry["cmc_multiplier"]
+    mult_unit = entry["cmc_mult_unit"]
+    if isnan(base):
+        return None
+    if mult_unit is None or multiplier == 0:
+        return base
+    if isnan(multiplier):
+        return None
+    if mult_unit == unit:
+        return base + multiplier * value
+    if mult_unit in ("%", "% rdg") and entry["cmc_uncertainty_unit"] in (None, unit):
+        return base + multiplier / 100 * value
+    return None
+
+
+class CmcLookup:
+    """
+    Memoized lookup and evaluation over a CMC index file.
+
+    Results are kept in a bounded LRU cache (see cache_info() for hits and
+    misses). The cache is dropped whenever a different scope revision is
+    loaded: explicitly with load(), or on the next query after close() or
+    after the file at path was replaced. Cached results are shared between
+    callers and must not be modified.
+
+    Windows will not replace a file another handle has mapped, so there
+    either load() a revision written to a new path, or close() before
+    write_cmc_index() rewrites path; the next query then reopens it.
+    """
+
+    def __init__(self, path, maxsize=4096):
+        self.maxsize = maxsize
+        self._index = None
+        self._cached_lookup = lru_cache(maxsize=maxsize)(self._lookup)
+        self._cached_evaluate = lru_cache(maxsize=maxsize)(self._evaluate)
+        self.revision = 0
+        self.load(path)
+
+    def load(self, path):
+        """Open path as the current scope revision and drop cached results."""
+        if self._index is not None:
+            self._index.close()
+        self.path = path
+        self._signature = self._stat(path)
+        self._index = CmcIndex(path)
+        self._cached_lookup.cache_clear()
+        self._cached_evaluate.cache_clear()
+        self.revision += 1
+
+    @staticmethod
+    def _stat(path):
+        st = stat(path)
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _check_revision(self):
+        if self._index is None or self._stat(self.path) != self._signature:
+            self.load(self.path)
+
+    def close(self):
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _lookup(self, equipment, parameter, value, unit):
+        return tuple(self._index.lookup(equipment, parameter, value, unit))
+
+    def _evaluate(self, equipment, parameter, value, unit):
+        return tuple(
+            (entry["row"], evaluate_cmc(entry, value, unit), entry["cmc_uncertainty_unit"])
+            for entry in self._cached_lookup(equipment, parameter, value, unit)
+        )
+
+    def lookup(self, equipment, parameter, value, unit):
+        """Cached CmcIndex.lookup(); returns a tuple of entries."""
+        self._check_revision()
+        return self._cached_lookup(equipment, parameter, value, unit)
+
+    def evaluate(self, equipment, parameter, value, unit):
+        """
+        Cached CMC values at value for every matching entry.
+
+        Returns:
+            tuple: ((row, cmc_or_None, uncertainty_unit), ...)
+        """
+        self._check_revision()
+        return self._cached_evaluate(equipment, parameter, value, unit)
+
+    def cache_info(self):
+        """Hit/miss counters of the lookup and evaluate caches."""
+        return {
+            "lookup": self._cached_lookup.cache_info(),
+            "evaluate": self._cached_evaluate.cache_info(),
+            "revision": self.revision,
+        }
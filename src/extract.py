@@ -1,12 +1,88 @@
-from re import fullmatch, compile, sub
+from re import compile
 from os import path
 import sys
+from bisect import bisect_left
 from json import load
+from logging import info, warning
+from operator import itemgetter
+
+from pdfplumber.utils import chars_to_textmap
+
+# First-column headers custom_parse_table knows how to parse.
+SUPPORTED_HEADERS = ("Parameter/Equipment", "Parameter/Range")
+
+# Fewest ruling lines/rects a page needs to hold even a one-row table.
+MIN_TABLE_RULES = 8
+
+# Footnote markers, superscripts and subscripts are set below this font size.
+SMALL_CHAR_SIZE = 7.5
+
+
+def get_resource_path(relative_path):
+    """ Get absolute path to resource, works for dev and for PyInstaller """
+    base_path = getattr(sys, '_MEIPASS', path.dirname(path.abspath(__file__)))
+    return path.join(base_path, relative_path)
+
+
+def table_header(page, table):
+    """
+    Cheaply read a detected table's first header cell.
+
+    Characters under SMALL_CHAR_SIZE (footnote markers, superscripts) are
+    dropped and whitespace is collapsed, as the full cell assembly would, so
+    "Parameter/Equipment¹" still reads as a supported header.
+
+    Returns:
+        str: The header text, or "" if the cell is missing or empty.
+    """
+    cell = table.rows[0].cells[0] if table.rows else None
+    if not cell:
+        return ""
+    crop = page.crop(cell).filter(
+        lambda obj: obj["object_type"] != "char" or obj["size"] >= SMALL_CHAR_SIZE
+    )
+    return " ".join((crop.extract_text() or "").split())
+
+
+def page_skip_reason(page):
+    """
+    Cheap pre-pass deciding whether a page can hold a CMC table.
+
+    Looks only at the page's ruling line/rect count and its raw characters
+    (for a SUPPORTED_HEADERS header), so cover, signature and note-only pages
+    never reach find_tables.
+
+    Returns:
+        str: Why the page can be skipped, or None if it is a candidate.
+    """
+    rules = len(page.lines) + len(page.rects)
+    if rules < MIN_TABLE_RULES:
+        return f"only {rules} ruling lines/rects"
+    text = "".join(c["text"] for c in page.chars if not c["text"].isspace())
+    if not any(header in text for header in SUPPORTED_HEADERS):
+        return "no supported table header"
+    return None
+
+
+def is_candidate_page(page, stats=None):
+    """
+    Run page_skip_reason(), logging skipped pages and recording them in
+    stats["pages_prefiltered"] as {"page", "reason"}.
+    """
+    reason = page_skip_reason(page)
+    if reason is None:
+        return True
+    info(f"Page {page.page_number}: skipped by prefilter ({reason})")
+    if stats is not None:
+        stats.setdefault("pages_prefiltered", []).append(
+            {"page": page.page_number, "reason": reason}
+        )
+    return False
 
 
 def remove_small_chars(clust):
     for ln in clust:
-        if all(c["size"] < 7.5 for c in ln["chars"]):
+        if all(c["size"] < SMALL_CHAR_SIZE for c in ln["chars"]):
             return
         median_y1 = sorted([char["y1"] for char in ln["chars"]])[len(ln["chars"]) // 2]
         string = ""
@@ -14,7 +90,7 @@ def remove_small_chars(clust):
         for char in ln["text"]:
             if char == " ":
                 string += char
-            elif ln["chars"][i]["size"] > 7.5 and ln["chars"][i]["y1"] < median_y1 + 1:
+            elif ln["chars"][i]["size"] > SMALL_CHAR_SIZE and ln["chars"][i]["y1"] < median_y1 + 1:
                 string += ln["chars"][i]["text"]
                 i += 1
             else:
@@ -24,35 +100,330 @@ def remove_small_chars(clust):
         ln["text"] = string.strip()
 
 
-def custom_extract_tables(
-    page, table_settings=None, vertical_thresh=14, indent_thresh=4
-):
+class CellTextAssembler:
     """
-    Custom table extraction from a pdfplumber Page.
+    Turns the text lines of a table cell into its visual rows.
+
+    Build one per run and reuse it for every cell: the line patterns are
+    compiled once and the subscript mapping is loaded once into a
+    str.translate table. No per-cell state is kept between calls.
     """
+
     BEGIN_LINE_PATTERN_DEFAULT = compile(r"^(?:\d|\(\d|\-\d|\(-\d|[<>]\s*\d)")
     BEGIN_LINE_PATTERN_SECOND = compile(r"^(?:\d|\(\d|\-\d|\(-\d|[<>]\s*\d|[\(≤<>])")
+    SUBSCRIPT_CANDIDATE = compile(r"[A-Za-z0-9]+")
+    SUBSCRIPT_SWAP = compile(r"([A-Za-z])\s+([A-Za-z])((?:[₀₁₂₃₄₅₆₇₈₉])\b)")
+
+    def __init__(self, vertical_thresh=14, indent_thresh=4, tol_top=2, tol_font=1):
+        self.vertical_thresh = vertical_thresh
+        self.indent_thresh = indent_thresh
+        self.tol_top = tol_top
+        self.tol_font = tol_font
+        with open(get_resource_path('subscript_mapping.json'), 'r', encoding='utf-8') as f:
+            self.subscript_table = str.maketrans(load(f))
+
+    def convert_to_subscript(self, s):
+        return s.translate(self.subscript_table)
+
+    def is_subscript_candidate(self, text):
+        """Short (one or two character) alphanumeric text, e.g. the "0" in R₀."""
+        return len(text) <= 2 and self.SUBSCRIPT_CANDIDATE.fullmatch(text) is not None
 
+    @staticmethod
     def get_first_word_width(ln):
         if "chars" not in ln or not ln["chars"]:
             return 0
-        first_word_chars = []
+        first = last = None
         for c in ln["chars"]:
             if c["text"].isspace():
-                if first_word_chars:
+                if first is not None:
                     break
-                else:
-                    continue
-            first_word_chars.append(c)
-        if not first_word_chars:
+                continue
+            if first is None:
+                first = c
+            last = c
+        if first is None:
             return 0
-        return first_word_chars[-1]["x1"] - first_word_chars[0]["x0"]
+        return last["x1"] - first["x0"]
+
+    def assemble(self, lines, cell, col_idx):
+        """
+        Build the visual rows for one cell.
+
+        Args:
+            lines (list): The cell's extract_text_lines(return_chars=True) output.
+            cell (tuple): The cell's (x0, top, x1, bottom) bounding box.
+            col_idx (int): The cell's column index.
+
+        Returns:
+            list: [{"text": str, "top": float}, ...]
+        """
+        if not lines:
+            return [{"text": "", "top": None}]
+        lines.sort(key=lambda ln: ln["top"])
+        clusters = self._cluster_lines(lines, cell, col_idx)
+        cluster_info = self._describe_clusters(clusters)
+        groups = self._group_clusters(cluster_info)
+        base_indent = lines[0]["x0"] - cell[0]
+        visual_rows = []
+        for group in groups:
+            row = self._merge_group(group, cell, base_indent)
+            if row is not None:
+                visual_rows.append(row)
+        return visual_rows
+
+    def assemble_draft(self, lines, cell, col_idx):
+        """
+        Cheap stand-in for assemble() used by draft extraction.
+
+        Consecutive lines are joined on vertical gap, indent and the line-start
+        patterns only: there is no remove_small_chars() pass, first-word-width
+        clustering or subscript regrouping, so wrapped text and subscripts can
+        differ from assemble().
+        """
+        if not lines:
+            return [{"text": "", "top": None}]
+        pattern = (
+            self.BEGIN_LINE_PATTERN_SECOND
+            if col_idx == 1
+            else self.BEGIN_LINE_PATTERN_DEFAULT
+        )
+        base_x0 = lines[0]["x0"]
+        visual_rows = []
+        prev = None
+        for ln in lines:
+            if (
+                prev is not None
+                and ln["top"] - prev["top"] < self.vertical_thresh
+                and abs(ln["x0"] - prev["x0"]) <= self.indent_thresh
+                and not pattern.search(ln["text"])
+            ):
+                visual_rows[-1]["text"] += " " + ln["text"]
+            else:
+                text = ln["text"]
+                if ln["x0"] > base_x0 + self.indent_thresh:
+                    text = f"\t{text}"
+                visual_rows.append({"text": text, "top": ln["top"]})
+            prev = ln
+        return visual_rows
+
+    def _cluster_lines(self, lines, cell, col_idx):
+        pattern = (
+            self.BEGIN_LINE_PATTERN_SECOND
+            if col_idx == 1
+            else self.BEGIN_LINE_PATTERN_DEFAULT
+        )
+        clusters = []
+        current_cluster = [lines[0]]
+        for ln in lines[1:]:
+            prev = current_cluster[-1]
+            if ln["top"] - prev["top"] >= self.vertical_thresh:
+                clusters.append(current_cluster)
+                current_cluster = [ln]
+                continue
+            indent_prev = prev["x0"] - cell[0]
+            indent_candidate = ln["x0"] - cell[0]
+            if abs(indent_prev - indent_candidate) > self.indent_thresh:
+                clusters.append(current_cluster)
+                current_cluster = [ln]
+            # Use the second column pattern only for the 2nd column (col index 1)
+            elif pattern.search(ln["text"].strip()):
+                clusters.append(current_cluster)
+                current_cluster = [ln]
+            elif cell[2] - prev["x1"] >= self.get_first_word_width(ln):
+                clusters.append(current_cluster)
+                current_cluster = [ln]
+            else:
+                current_cluster.append(ln)
+        clusters.append(current_cluster)
+        return clusters
+
+    def _describe_clusters(self, clusters):
+        cluster_info = []
+        for clust in clusters:
+            if not clust:
+                continue
+            remove_small_chars(clust)
+            size_total = 0
+            size_count = 0
+            for ln in clust:
+                for c in ln.get("chars", []):
+                    if c.get("size"):
+                        size_total += c["size"]
+                        size_count += 1
+            cluster_info.append(
+                {
+                    "text": " ".join(ln["text"] for ln in clust).strip(),
+                    "min_x0": min(ln["x0"] for ln in clust),
+                    "max_x1": max(ln["x1"] for ln in clust),
+                    "top": min(ln["top"] for ln in clust),
+                    "font_size": size_total / size_count if size_count else 0,
+                }
+            )
+        return cluster_info
+
+    def _group_clusters(self, cluster_info):
+        groups = []
+        if not cluster_info:
+            return groups
+        current_group = [cluster_info[0]]
+        for c in cluster_info[1:]:
+            # If the vertical difference is small, just add to the current group.
+            if abs(c["top"] - current_group[0]["top"]) < 5:
+                current_group.append(c)
+            # Merge a short alphanumeric candidate (subscript) even though the
+            # vertical gap is larger.
+            elif self.is_subscript_candidate(c["text"].strip()):
+                current_group.append(c)
+            else:
+                groups.append(current_group)
+                current_group = [c]
+        groups.append(current_group)
+        return groups
+
+    def _merge_group(self, group, cell, base_indent):
+        baseline_cluster = max(group, key=lambda c: len(c["text"]))
+        baseline_top = baseline_cluster["top"]
+        baseline_font = baseline_cluster.get("font_size", 0)
+        filtered_group = [
+            c
+            for c in group
+            if (baseline_top - c["top"]) <= self.tol_top
+            or (baseline_font - c["font_size"]) <= self.tol_font
+        ]
+        if not filtered_group:
+            return None
+        filtered_group.sort(key=lambda c: c["min_x0"])
+        merged_text = filtered_group[0]["text"]
+        current_max = filtered_group[0]["max_x1"]
+        for c in filtered_group[1:]:
+            trimmed_text = c["text"].strip()
+            if self.is_subscript_candidate(trimmed_text):
+                candidate = self.convert_to_subscript(trimmed_text)
+                # If the merged text ends with a closing parenthesis,
+                # insert the candidate before that.
+                if merged_text.endswith(")"):
+                    merged_text = merged_text[:-1].rstrip() + candidate + ")"
+                else:
+                    merged_text = merged_text.rstrip() + candidate
+            elif c["min_x0"] - current_max < 3:
+                merged_text = merged_text.rstrip() + c["text"]
+            else:
+                merged_text = merged_text + " " + c["text"]
+            current_max = max(current_max, c["max_x1"])
+
+        merged_text = self.SUBSCRIPT_SWAP.sub(r"\1\3\2", merged_text)
+        indent = filtered_group[0]["min_x0"] - cell[0]
+        if indent > base_indent + self.indent_thresh:
+            merged_text = f"\t{merged_text}"
+        return {"text": merged_text, "top": filtered_group[0]["top"]}
+
+
+def _center(obj):
+    return (obj["x0"] + obj["x1"]) / 2, (obj["top"] + obj["bottom"]) / 2
+
+
+def _draft_table_rows(page, table, assembler, stats=None):
+    """
+    Read a table's cells for draft mode.
+
+    Characters are assigned to cells by their centre in one pass over the
+    table, instead of cropping the page once per cell, and each cell is read
+    with a plain (non-layout) line extraction. Characters under
+    SMALL_CHAR_SIZE are dropped from cells that also hold normal-size text, so
+    footnote markers go but so do subscripts; a cell set entirely in small
+    type is kept, as remove_small_chars() would.
+    """
+    x0, top, x1, bottom = table.bbox
+    chars = []
+    for char in page.chars:
+        x, y = _center(char)
+        if x0 <= x < x1 and top <= y < bottom:
+            chars.append((y, char))
+    chars.sort(key=itemgetter(0))
+    mids = [y for y, _ in chars]
+
+    table_rows = []
+    for row in table.rows:
+        row_cells = []
+        for col_idx, cell in enumerate(row.cells):
+            if not cell:
+                row_cells.append([])
+                continue
+            cell_chars = [
+                char
+                for _, char in chars[bisect_left(mids, cell[1]):bisect_left(mids, cell[3])]
+                if cell[0] <= _center(char)[0] < cell[2]
+            ]
+            if any(char["size"] >= SMALL_CHAR_SIZE for char in cell_chars):
+                cell_chars = [c for c in cell_chars if c["size"] >= SMALL_CHAR_SIZE]
+            if cell_chars:
+                lines = chars_to_textmap(cell_chars).extract_text_lines(return_chars=False)
+            else:
+                lines = []
+                if stats is not None:
+                    stats["empty_cells"] += 1
+            row_cells.append(assembler.assemble_draft(lines, cell, col_idx))
+        table_rows.append(row_cells)
+    return table_rows
+
+
+def custom_extract_tables(
+    page,
+    table_settings=None,
+    vertical_thresh=14,
+    indent_thresh=4,
+    stats=None,
+    assembler=None,
+    draft=False,
+):
+    """
+    Custom table extraction from a pdfplumber Page.
+
+    Tables whose first header is not in SUPPORTED_HEADERS (page headers,
+    footers, signature blocks...) are skipped before any per-cell work, and
+    cells without any characters skip the layout text extraction.
+
+    With draft=True, cells are read with a plain line-based pass
+    (CellTextAssembler.assemble_draft) for quick previews. Row counts and
+    equipment names generally match, but wrapped text and subscripts are not
+    reconstructed, and small type is dropped per cell rather than per line;
+    see benchmarks/draft.py for the row-level differences.
+
+    If a stats dict is given, it is updated with "tables_extracted",
+    "tables_skipped" (a list of {"page", "header"}) and "empty_cells".
+
+    Pass a CellTextAssembler to reuse it across pages; otherwise one is built
+    from vertical_thresh and indent_thresh.
+    """
+    if stats is not None:
+        stats.setdefault("tables_extracted", 0)
+        stats.setdefault("tables_skipped", [])
+        stats.setdefault("empty_cells", 0)
+    if assembler is None:
+        assembler = CellTextAssembler(vertical_thresh, indent_thresh)
 
     # Use pdfplumber's table finder.
     tables = page.find_tables(table_settings=table_settings)
     custom_tables = []
 
     for table in tables:
+        header = table_header(page, table)
+        if header not in SUPPORTED_HEADERS:
+            # A "Parameter..." header is probably a scope table we failed to
+            # recognise, not a page header or signature block.
+            log = warning if header.startswith("Parameter") else info
+            log(f"Page {page.page_number}: skipping table with header {header!r}")
+            if stats is not None:
+                stats["tables_skipped"].append(
+                    {"page": page.page_number, "header": header}
+                )
+            continue
+        if stats is not None:
+            stats["tables_extracted"] += 1
+        if draft:
+            custom_tables.append(_draft_table_rows(page, table, assembler, stats))
+            continue
         table_rows = []
         for row in table.rows:
             row_cells = []
@@ -61,159 +432,13 @@ def custom_extract_tables(
                     row_cells.append([])
                     continue
                 cell_crop = page.crop(cell)
-                lines = cell_crop.extract_text_lines(layout=True, return_chars=True)
-                visual_rows = []
-                if not lines:
-                    visual_rows.append({"text": "", "top": None})
+                if cell_crop.chars:
+                    lines = cell_crop.extract_text_lines(layout=True, return_chars=True)
                 else:
-                    lines.sort(key=lambda ln: ln["top"])
-                    clusters = []
-                    current_cluster = [lines[0]]
-                    for ln in lines[1:]:
-                        vertical_gap = ln["top"] - current_cluster[-1]["top"]
-                        if vertical_gap >= vertical_thresh:
-                            clusters.append(current_cluster)
-                            current_cluster = [ln]
-                            continue
-                        available_space = cell[2] - current_cluster[-1]["x1"]
-                        first_word_width = get_first_word_width(ln)
-                        indent_prev = current_cluster[-1]["x0"] - cell[0]
-                        indent_candidate = ln["x0"] - cell[0]
-                        if abs(indent_prev - indent_candidate) > indent_thresh:
-                            clusters.append(current_cluster)
-                            current_cluster = [ln]
-                        # Use the second column pattern only for the 2nd column (col index 1)
-                        elif (
-                            BEGIN_LINE_PATTERN_SECOND
-                            if col_idx == 1
-                            else BEGIN_LINE_PATTERN_DEFAULT
-                        ).search(ln["text"].strip()):
-                            clusters.append(current_cluster)
-                            current_cluster = [ln]
-                        elif available_space >= first_word_width:
-                            clusters.append(current_cluster)
-                            current_cluster = [ln]
-                        else:
-                            current_cluster.append(ln)
-                    clusters.append(current_cluster)
-
-                    def get_resource_path(relative_path):
-                        """ Get absolute path to resource, works for dev and for PyInstaller """
-                        base_path = getattr(sys, '_MEIPASS', path.dirname(path.abspath(__file__)))
-                        return path.join(base_path, relative_path)
-
-                    def convert_to_subscript(s):
-                        with open(get_resource_path('subscript_mapping.json'), 'r', encoding='utf-8') as f:
-                            mapping = load(f)
-                        return "".join(mapping.get(char, char) for char in s)
-
-                    cluster_info = []
-                    for clust in clusters:
-                        if not clust:
-                            continue
-                        remove_small_chars(clust)
-                        text = " ".join(ln["text"] for ln in clust).strip()
-                        min_x0 = min(ln["x0"] for ln in clust)
-                        max_x1 = max(ln["x1"] for ln in clust)
-                        top_val = min(ln["top"] for ln in clust)
-                        sizes = [
-                            c.get("size", 0)
-                            for ln in clust
-                            for c in ln.get("chars", [])
-                            if c.get("size")
-                        ]
-                        avg_font_size = sum(sizes) / len(sizes) if sizes else 0
-                        cluster_info.append(
-                            {
-                                "text": text,
-                                "min_x0": min_x0,
-                                "max_x1": max_x1,
-                                "top": top_val,
-                                "font_size": avg_font_size,
-                            }
-                        )
-
-                    grouped_clusters = []
-                    if cluster_info:
-                        current_group = [cluster_info[0]]
-                        for c in cluster_info[1:]:
-                            # If the vertical difference is small, just add to the current group.
-                            if abs(c["top"] - current_group[0]["top"]) < 5:
-                                current_group.append(c)
-                            else:
-                                # Check if this new cluster is a short alphanumeric candidate (subscript)
-                                trimmed = c["text"].strip()
-                                if len(trimmed) <= 2 and fullmatch(
-                                    r"[A-Za-z0-9]+", trimmed
-                                ):
-                                    # Merge it with the current group even though the vertical gap is larger.
-                                    current_group.append(c)
-                                else:
-                                    grouped_clusters.append(current_group)
-                                    current_group = [c]
-                        grouped_clusters.append(current_group)
-                    else:
-                        grouped_clusters = []
-
-                    merged_rows = []
-                    tol_top = 2
-                    tol_font = 1
-                    for group in grouped_clusters:
-                        baseline_cluster = max(group, key=lambda c: len(c["text"]))
-                        baseline_top = baseline_cluster["top"]
-                        baseline_font = baseline_cluster.get("font_size", 0)
-                        filtered_group = [
-                            c
-                            for c in group
-                            if any(
-                                [
-                                    (baseline_top - c["top"]) <= tol_top,
-                                    (baseline_font - c["font_size"]) <= tol_font,
-                                ]
-                            )
-                        ]
-                        if not filtered_group:
-                            continue
-                        filtered_group.sort(key=lambda c: c["min_x0"])
-                        merged_text = filtered_group[0]["text"]
-                        current_max = filtered_group[0]["max_x1"]
-                        for c in filtered_group[1:]:
-                            trimmed_text = c["text"].strip()
-                            # If the candidate is a short alphanumeric string (one or two characters)
-                            if len(trimmed_text) <= 2 and fullmatch(
-                                r"[A-Za-z0-9]+", trimmed_text
-                            ):
-                                candidate = convert_to_subscript(trimmed_text)
-                                # If the merged text ends with a closing parenthesis,
-                                # insert the candidate before that.
-                                if merged_text.endswith(")"):
-                                    merged_text = (
-                                        merged_text[:-1].rstrip() + candidate + ")"
-                                    )
-                                else:
-                                    merged_text = merged_text.rstrip() + candidate
-                            else:
-                                gap = c["min_x0"] - current_max
-                                if gap < 3:
-                                    merged_text = merged_text.rstrip() + c["text"]
-                                else:
-                                    merged_text = merged_text + " " + c["text"]
-                            current_max = max(current_max, c["max_x1"])
-
-                        merged_text = sub(
-                            r"([A-Za-z])\s+([A-Za-z])((?:[₀₁₂₃₄₅₆₇₈₉])\b)",
-                            r"\1\3\2",
-                            merged_text,
-                        )
-                        base_indent = lines[0]["x0"] - cell[0]
-                        indent = filtered_group[0]["min_x0"] - cell[0]
-                        if indent > base_indent + indent_thresh:
-                            merged_text = f"\t{merged_text}"
-                        merged_rows.append(
-                            {"text": merged_text, "top": filtered_group[0]["top"]}
-                        )
-                    visual_rows.extend(merged_rows)
-                row_cells.append(visual_rows)
+                    lines = []
+                    if stats is not None:
+                        stats["empty_cells"] += 1
+                row_cells.append(assembler.assemble(lines, cell, col_idx))
             table_rows.append(row_cells)
         custom_tables.append(table_rows)
     return custom_tables
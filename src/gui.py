@@ -0,0 +1,118 @@
+from queue import Empty, Queue
+from threading import Event, Thread
+from time import perf_counter
+from tkinter import StringVar, Toplevel
+from tkinter.ttk import Button, Label, Progressbar
+
+
+class ProcessingCancelled(Exception):
+    """Raised by a ProgressWindow job that stopped because cancel was set."""
+
+
+def format_eta(seconds: float) -> str:
+    """Format a number of seconds as m:ss."""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+class ProgressWindow:
+    """
+    Small window that runs a job on a worker thread and shows its progress.
+
+    The job is called as target(progress, cancel), where progress is a
+    callback taking (page_number, page_count, rows) and cancel is a
+    threading.Event the job should check between pages, raising
+    ProcessingCancelled when it stops early. Tkinter is not
+    thread-safe, so the worker only posts updates to a queue and the window
+    polls it from the Tk event loop.
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, title="Processing PDF"):
+        self.window = Toplevel()
+        self.window.title(title)
+        self.window.resizable(False, False)
+        self.status = StringVar(value="Opening PDF...")
+        Label(self.window, textvariable=self.status, width=48).pack(
+            padx=12, pady=(12, 4)
+        )
+        self.bar = Progressbar(self.window, length=320, mode="determinate")
+        self.bar.pack(padx=12, pady=4)
+        self.button = Button(self.window, text="Cancel", command=self.cancel)
+        self.button.pack(pady=(4, 12))
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.cancel_event = Event()
+        self.updates = Queue()
+        self.result = None
+        self.error = None
+        self.start = None
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.status.set("Cancelling after the current page...")
+        self.button.state(["disabled"])
+
+    def _report(self, page_number, page_count, rows):
+        # Called on the worker thread.
+        self.updates.put((page_number, page_count, rows))
+
+    def _work(self, target):
+        try:
+            self.result = target(self._report, self.cancel_event)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.updates.put(None)
+
+    def _show(self, page_number, page_count, rows):
+        if self.cancel_event.is_set():
+            return
+        elapsed = perf_counter() - self.start
+        eta = elapsed / page_number * (page_count - page_number)
+        self.bar.configure(maximum=page_count, value=page_number)
+        if page_number == page_count:
+            self.status.set(f"Parsing {rows} rows...")
+            return
+        self.status.set(
+            f"Page {page_number}/{page_count} - {rows} rows - ETA {format_eta(eta)}"
+        )
+
+    def _poll(self):
+        try:
+            while True:
+                update = self.updates.get_nowait()
+                if update is None:
+                    self.window.quit()
+                    return
+                self._show(*update)
+        except Empty:
+            pass
+        self.window.after(self.POLL_MS, self._poll)
+
+    def run(self, target):
+        """
+        Run target on a worker thread until it finishes or is cancelled.
+
+        Returns:
+            The target's result, or None if it raised ProcessingCancelled.
+        """
+        self.start = perf_counter()
+        worker = Thread(target=self._work, args=(target,), daemon=True)
+        worker.start()
+        self.window.after(self.POLL_MS, self._poll)
+        self.window.mainloop()
+        worker.join()
+        self.window.destroy()
+        return self._outcome()
+
+    def _outcome(self):
+        # Cancel only counts if the job actually stopped for it: a job that
+        # finished, or failed for another reason, after Cancel was pressed
+        # still returns its result or raises its error.
+        if isinstance(self.error, ProcessingCancelled):
+            return None
+        if self.error is not None:
+            raise self.error
+        return self.result
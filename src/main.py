@@ -5,8 +5,15 @@ from logging import basicConfig, INFO, DEBUG, info, warning
 from json import dumps
 from pandas import DataFrame, Series
 from src.range import parse_range
-from src.extract import custom_extract_tables
-from src.cmc import parse_budget
+from src.extract import CellTextAssembler, custom_extract_tables, is_candidate_page
+from src.cmc import parse_budget_columns
+from src.memory import RssSampler, check_rss_ceiling, current_rss_mb, release_page
+from src.gui import ProcessingCancelled, ProgressWindow
+from src.cmcindex import write_cmc_index
+from src.watchdog import PageWatchdog
+from os import path
+from contextlib import ExitStack, nullcontext
+from multiprocessing import freeze_support
 
 
 # Logging configuration
@@ -16,9 +23,44 @@ basicConfig(filename=logfile, level=DEBUG, filemode="w")
 
 DASH_PATTERN = compile(r"\s*–\s*")
 
+# Columns parse_table_rows adds to the custom_parse_table columns.
+PARSED_COLUMNS = [
+    "range_min",
+    "range_min_unit",
+    "range_max",
+    "range_max_unit",
+    "frequency_range_min",
+    "frequency_range_min_unit",
+    "frequency_range_max",
+    "frequency_range_max_unit",
+    "cmc_base",
+    "cmc_multiplier",
+    "cmc_mult_unit",
+    "cmc_uncertainty_unit",
+]
+
+# Per-page budget for the GUI: pages run in a watchdog worker so one
+# pathological page is retried or skipped instead of hanging the app.
+GUI_PAGE_TIMEOUT = 120
+GUI_PAGE_MEMORY_MB = 2048
+
 
 def main(pdf_path):
-    df = pdf_table_processor(pdf_path)
+    df = ProgressWindow().run(
+        lambda progress, cancel: pdf_table_processor(
+            pdf_path,
+            progress=progress,
+            cancel=cancel,
+            page_timeout=GUI_PAGE_TIMEOUT,
+            page_memory_mb=GUI_PAGE_MEMORY_MB,
+        )
+    )
+    if df is None:
+        warning("Processing was cancelled. No file was saved.")
+        return
+    if skipped := df.attrs["extract_stats"].get("pages_skipped"):
+        pages = ", ".join(str(p["page"]) for p in skipped)
+        warning(f"Pages over the per-page budget were skipped: {pages}")
 
     info("Exporting parsed range data to CSV...")
     if parsed_csv_file_path := filedialog.asksaveasfilename(
@@ -28,73 +70,236 @@ def main(pdf_path):
     ):
         df.to_csv(parsed_csv_file_path, index=False, encoding="utf-8-sig")
         info(f"Exported parsed range data to '{parsed_csv_file_path}'")
+        index_path = path.splitext(parsed_csv_file_path)[0] + ".cmcidx"
+        try:
+            write_cmc_index(df, index_path)
+        except OSError as e:
+            # The CSV is already saved; the index is a convenience.
+            warning(f"Could not write CMC lookup index '{index_path}': {e}")
+        else:
+            info(f"Exported CMC lookup index to '{index_path}'")
     else:
         warning("Save operation was cancelled. No file was saved.")
 
 
-def pdf_table_processor(pdf_path: str, save_intermediate=False) -> DataFrame:
+def pdf_table_processor(
+    pdf_path: str,
+    save_intermediate=False,
+    bounded_memory=False,
+    max_rss_mb=None,
+    progress=None,
+    cancel=None,
+    page_timeout=None,
+    page_memory_mb=None,
+    prefilter_pages=True,
+    draft=False,
+) -> DataFrame:
     """Process the PDF file and extract the table data into a DataFrame.
 
     Args:
         pdf_path (str): Path to the PDF file.
         save_intermediate (bool, optional): Save intermediate JSON files. Defaults to False.
+        bounded_memory (bool, optional): Release each page's layout caches once its
+            tables are extracted and record per-page memory in
+            `df.attrs["page_stats"]`: "peak_rss_mb" is the highest RSS sampled
+            while the page was being extracted (see RssSampler) and "rss_mb" the
+            RSS after the page is released. Defaults to False.
+        max_rss_mb (float, optional): Raise MemoryCeilingExceeded if the process RSS
+            is still above this many MB after a page is released. Implies
+            bounded_memory. Defaults to None.
+        progress (callable, optional): Called after each page as
+            progress(page_number, page_count, rows_so_far). Defaults to None.
+        cancel (threading.Event, optional): When set, processing stops before the
+            next page and ProcessingCancelled is raised. Defaults to None.
+        page_timeout (float, optional): Extract pages in an isolated worker and give
+            each page this many seconds before it is retried with cheaper settings
+            or skipped (see PageWatchdog). Defaults to None.
+        page_memory_mb (float, optional): Like page_timeout, but a budget on the
+            worker's RSS. Defaults to None. The watchdog options bound memory per
+            page themselves, so combining them with bounded_memory or max_rss_mb
+            raises ValueError.
+        prefilter_pages (bool, optional): Skip pages that fail the cheap
+            is_candidate_page() check without running find_tables on them; skips
+            are logged and listed in `extract_stats["pages_prefiltered"]`.
+            Defaults to True.
+        draft (bool, optional): Use custom_extract_tables' fast draft mode, for
+            previews only; the result is marked with `df.attrs["draft"]`.
+            Defaults to False.
 
     Returns:
-        DataFrame:
+        DataFrame: Extraction stats (see custom_extract_tables and PageWatchdog)
+            are in `df.attrs["extract_stats"]`.
     """
+    if draft:
+        warning("Draft extraction: wrapped text and subscripts are not reconstructed.")
+    use_watchdog = page_timeout is not None or page_memory_mb is not None
+    if use_watchdog and (bounded_memory or max_rss_mb is not None):
+        raise ValueError(
+            "bounded_memory/max_rss_mb cannot be combined with page_timeout/"
+            "page_memory_mb; use page_memory_mb to cap memory in the watchdog"
+        )
+    bounded_memory = bounded_memory or max_rss_mb is not None
+    page_stats = []
+    extract_stats = {}
     table_rows = []
-    with pdfopen(pdf_path) as pdf:
-        for page in pdf.pages:
-            tables = custom_extract_tables(page)
+    with ExitStack() as stack:
+        if use_watchdog:
+            watchdog = stack.enter_context(
+                PageWatchdog(
+                    pdf_path,
+                    timeout=page_timeout,
+                    max_memory_mb=page_memory_mb,
+                    prefilter=prefilter_pages,
+                    draft=draft,
+                )
+            )
+            pages = watchdog.pages(extract_stats)
+        else:
+            pdf = stack.enter_context(pdfopen(pdf_path))
+            pages = _extract_pages(
+                pdf,
+                extract_stats,
+                page_stats if bounded_memory else None,
+                max_rss_mb,
+                prefilter_pages,
+                draft,
+            )
+        while True:
+            if cancel is not None and cancel.is_set():
+                raise ProcessingCancelled(f"Cancelled after {len(table_rows)} rows")
+            if (page := next(pages, None)) is None:
+                break
+            page_number, page_count, tables = page
             # Save intermediate results if requested
             if save_intermediate:
-                with open(f"export/pages/json/page{page.page_number}.json", "w") as f:
+                with open(f"export/pages/json/page{page_number}.json", "w") as f:
                     f.write(dumps(tables, indent=2))
             for i, table in enumerate(tables):
                 parsed_table_rows = custom_parse_table(table)
                 table_rows.extend(parsed_table_rows)
                 if save_intermediate:
-                    with open(f"export/tables/json/page{page.page_number}_table{i}.csv", "w", encoding="utf-8-sig") as f:
+                    with open(f"export/tables/json/page{page_number}_table{i}.csv", "w", encoding="utf-8-sig") as f:
                         f.write(dumps(table, indent=2))
-                    with open(f"export/tables/csv/page{page.page_number}_table{i}.csv", "w", encoding="utf-8-sig") as f:
+                    with open(f"export/tables/csv/page{page_number}_table{i}.csv", "w", encoding="utf-8-sig") as f:
                         DataFrame(parsed_table_rows).to_csv(f, index=False)
+            if progress is not None:
+                progress(page_number, page_count, len(table_rows))
+    df = parse_table_rows(table_rows, save_intermediate)
+    df.attrs["extract_stats"] = extract_stats
+    df.attrs["draft"] = draft
+    if bounded_memory:
+        df.attrs["page_stats"] = page_stats
+    return df
+
+
+def _extract_pages(
+    pdf, extract_stats, page_stats=None, max_rss_mb=None, prefilter=False, draft=False
+):
+    """Yield (page_number, page_count, tables) for each page, in this process.
+
+    If page_stats is a list, each page's layout caches are released once its
+    tables are extracted and its memory use is appended to page_stats. With
+    prefilter, pages that fail is_candidate_page() yield no tables.
+    """
+    assembler = CellTextAssembler()
+    page_count = len(pdf.pages)
+    for page in pdf.pages:
+        sampler = RssSampler() if page_stats is not None else nullcontext()
+        with sampler:
+            if prefilter and not is_candidate_page(page, extract_stats):
+                tables = []
+            else:
+                tables = custom_extract_tables(
+                    page, stats=extract_stats, assembler=assembler, draft=draft
+                )
+        if page_stats is not None:
+            release_page(page)
+            if max_rss_mb is not None:
+                rss = check_rss_ceiling(max_rss_mb, page.page_number)
+            else:
+                rss = current_rss_mb()
+            info(
+                f"Page {page.page_number}: peak RSS {sampler.peak_mb:.1f} MB, "
+                f"{rss:.1f} MB after release"
+            )
+            page_stats.append(
+                {
+                    "page": page.page_number,
+                    "peak_rss_mb": sampler.peak_mb,
+                    "rss_mb": rss,
+                }
+            )
+        yield page.page_number, page_count, tables
+
+
+def parse_table_rows(table_rows, save_intermediate=False) -> DataFrame:
+    """Run the range, frequency and CMC parse stages over custom_parse_table rows.
+
+    Args:
+        table_rows (list): Rows of [Equipment, Parameter, Range, Frequency, CMC (±), Comments].
+        save_intermediate (bool, optional): Save intermediate CSV files. Defaults to False.
+
+    Returns:
+        DataFrame:
+    """
     columns = ["Equipment", "Parameter", "Range", "Frequency", "CMC (±)", "Comments"]
     df = DataFrame(table_rows, columns=columns)
+    if df.empty:
+        # e.g. every page was skipped; keep the full set of output columns.
+        return df.reindex(columns=columns + PARSED_COLUMNS)
 
     if save_intermediate:
         df.to_csv("export/parsed.csv", index=False, encoding="utf-8-sig")
         info("Exported parsed data to 'export/parsed.csv'")
 
     info("Parsing ranges...")
-    df[["range_min", "range_min_unit", "range_max", "range_max_unit"]] = df[
-        "Range"
-    ].apply(lambda x: Series(parse_range(x)))
+    df[["range_min", "range_min_unit", "range_max", "range_max_unit"]] = parse_range_column(df["Range"])
     if save_intermediate:
         df.to_csv("export/range_parsed.csv", index=False, encoding="utf-8-sig")
         info("Exported parsed range data to 'export/range_parsed.csv'")
 
     info("Parsing frequencies...")
-    df[["frequency_range_min", "frequency_range_min_unit", "frequency_range_max", "frequency_range_max_unit"]] = df[
-        "Frequency"
-    ].apply(lambda x: Series(parse_range(x)))
+    df[["frequency_range_min", "frequency_range_min_unit", "frequency_range_max", "frequency_range_max_unit"]] = parse_range_column(df["Frequency"])
     if save_intermediate:
         df.to_csv("export/frequency_parsed.csv", index=False, encoding="utf-8-sig")
         info("Exported parsed frequency data to 'export/frequency_parsed.csv'")
 
     info("Parsing CMC budgets...")
-    df[["cmc_base", "cmc_multiplier", "cmc_mult_unit", "cmc_uncertainty_unit"]] = df[
-        "CMC (±)"
-    ].apply(lambda x: parse_budget(x).__series__())
-
-    def update_cmc_mult_unit(row):
-        if row['cmc_mult_unit'] in {'D', 'L', 'W'}:
-            if row['range_min_unit'] != row['range_max_unit']:
-                warning(f"Unexpected cmc_mult_unit '{row['cmc_mult_unit']}' found in the data.")
-            row['cmc_mult_unit'] = row['range_min_unit']
-        return row
+    cmc_columns = ["cmc_base", "cmc_multiplier", "cmc_mult_unit", "cmc_uncertainty_unit"]
+    for column, values in zip(cmc_columns, parse_budget_columns(df["CMC (±)"])):
+        df[column] = Series(values, index=df.index, dtype=object)
+
     info("Cleaning up the data...")
-    df = df.apply(update_cmc_mult_unit, axis=1)
-    return df
+    return resolve_cmc_mult_units(df)
+
+
+def parse_range_column(texts: Series) -> DataFrame:
+    """Run parse_range over a column, returning its four fields as a DataFrame."""
+    return DataFrame([parse_range(text) for text in texts], index=texts.index)
+
+
+def resolve_cmc_mult_units(df: DataFrame) -> DataFrame:
+    """
+    Replace the D/L/W placeholder multiplier units with each row's range unit.
+
+    Rows whose range starts and ends in different units are ambiguous; they
+    still take the minimum's unit, and are reported in a single warning.
+    Column dtypes are then re-inferred, so an all-float cmc_multiplier comes
+    out as float64.
+    """
+    placeholder = df["cmc_mult_unit"].isin(["D", "L", "W"])
+    min_unit, max_unit = df["range_min_unit"], df["range_max_unit"]
+    mixed_units = (min_unit != max_unit) & ~(min_unit.isna() & max_unit.isna())
+    ambiguous = placeholder & mixed_units
+    if ambiguous.any():
+        found = ", ".join(f"'{unit}'" for unit in sorted(df.loc[ambiguous, "cmc_mult_unit"].unique()))
+        warning(
+            f"Unexpected cmc_mult_unit {found} found in {ambiguous.sum()} rows "
+            f"whose range units differ; used the range_min_unit."
+        )
+    df = df.copy()
+    df.loc[placeholder, "cmc_mult_unit"] = min_unit[placeholder]
+    return df.infer_objects()
 
 
 def flatten_hierarchical_comments(lines, delimiter="; "):
@@ -314,6 +519,8 @@ def custom_parse_table(input_data):
 
 
 if __name__ == "__main__":
+    # Needed for the page watchdog's worker processes in the frozen exe.
+    freeze_support()
     # Initialize file dialog for PDF selection.
     root = Tk()
     root.withdraw()
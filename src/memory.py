@@ -0,0 +1,79 @@
+from gc import collect
+from threading import Event, Thread
+
+from psutil import Process
+
+
+class MemoryCeilingExceeded(MemoryError):
+    """Raised when the process RSS grows past the configured ceiling."""
+
+
+_process = Process()
+
+
+def current_rss_mb() -> float:
+    """Return the resident set size of this process, in megabytes."""
+    return _process.memory_info().rss / (1024 * 1024)
+
+
+class RssSampler:
+    """
+    Context manager that samples this process's RSS on a helper thread.
+
+    peak_mb is the largest sample taken between entering and leaving the
+    block (including one at each end), so it is the peak of that block alone,
+    not of the process lifetime. Spikes shorter than `interval` seconds can
+    fall between samples.
+    """
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def __enter__(self):
+        self.peak_mb = current_rss_mb()
+        self._stop.clear()
+        self._thread = Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+
+def release_page(page) -> None:
+    """
+    Drop the layout caches pdfplumber keeps on a page.
+
+    pdfplumber holds on to a page's parsed layout, `chars`/`objects` and
+    edges until the page is closed, so a long document grows with every page
+    that has been read. Closing the page once its tables are extracted, and
+    collecting the reference cycles pdfminer's layout tree leaves behind,
+    keeps memory roughly flat across the run.
+    """
+    page.close()
+    collect()
+
+
+def check_rss_ceiling(max_rss_mb: float, page_number: int) -> float:
+    """
+    Raise MemoryCeilingExceeded if RSS is above max_rss_mb.
+
+    Returns:
+        float: The RSS that was measured, in megabytes.
+    """
+    rss = current_rss_mb()
+    if rss > max_rss_mb:
+        raise MemoryCeilingExceeded(
+            f"RSS {rss:.1f} MB exceeded the {max_rss_mb:.1f} MB ceiling "
+            f"after page {page_number}"
+        )
+    return rss
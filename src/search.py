@@ -0,0 +1,153 @@
+from bisect import bisect_left
+from collections import defaultdict
+from json import dump, load
+from math import log
+from re import compile
+
+# Words, decimals and compound units (in·H₂O, µV/V, ozf∙in) stay whole; "%"
+# and "°F"-style units are tokens of their own.
+TOKEN_PATTERN = compile(r"°?[^\W_]+(?:[·∙/.][^\W_]+)*|%")
+
+# Indexed columns and how much a match in each counts towards the score.
+FIELD_WEIGHTS = {"Equipment": 3.0, "Parameter": 2.0, "Comments": 1.0}
+
+# Columns stored with each row so results can be shown without the CSV.
+DOC_FIELDS = ["source", "Equipment", "Parameter", "Range", "Frequency", "CMC (±)", "Comments"]
+
+
+def tokenize(text):
+    """Split text into lower-case search tokens, keeping units as tokens."""
+    if not isinstance(text, str):
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class ScopeIndex:
+    """
+    Inverted index over the Equipment, Parameter and Comments of parsed scopes.
+
+    Build it from pdf_table_processor output with add(), persist it with
+    save(), and reopen it with ScopeIndex.open(), which defers reading the
+    file until the first query.
+    """
+
+    def __init__(self):
+        self._path = None
+        self._docs = []
+        self._postings = defaultdict(dict)
+        self._vocab = None
+
+    @classmethod
+    def open(cls, path):
+        """Return an index backed by path; the file is read on first use."""
+        index = cls()
+        index._path = path
+        return index
+
+    def _ensure_loaded(self):
+        if self._path is None:
+            return
+        with open(self._path, "r", encoding="utf-8") as f:
+            data = load(f)
+        self._path = None
+        self._docs = data["docs"]
+        self._postings = defaultdict(
+            dict,
+            {
+                token: {doc: weight for doc, weight in postings}
+                for token, postings in data["postings"].items()
+            },
+        )
+        self._vocab = None
+
+    def add(self, df, source=""):
+        """
+        Index every row of a pdf_table_processor DataFrame.
+
+        Args:
+            df (DataFrame): Parsed scope rows.
+            source (str, optional): Label for the scope revision the rows came from.
+        """
+        self._ensure_loaded()
+        self._vocab = None
+        columns = [field for field in DOC_FIELDS[1:] if field in df.columns]
+        for values in df[columns].itertuples(index=False, name=None):
+            row = dict(zip(columns, values))
+            doc_id = len(self._docs)
+            self._docs.append([source] + [row.get(field, "") for field in DOC_FIELDS[1:]])
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(row.get(field)):
+                    postings = self._postings[token]
+                    postings[doc_id] = postings.get(doc_id, 0) + weight
+
+    def save(self, path):
+        """Write the index to path as JSON."""
+        self._ensure_loaded()
+        with open(path, "w", encoding="utf-8") as f:
+            dump(
+                {
+                    "docs": self._docs,
+                    "postings": {
+                        token: list(postings.items())
+                        for token, postings in self._postings.items()
+                    },
+                },
+                f,
+                ensure_ascii=False,
+            )
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._docs)
+
+    def _expand(self, term, prefix):
+        if not prefix:
+            return [term] if term in self._postings else []
+        if self._vocab is None:
+            self._vocab = sorted(self._postings)
+        matches = []
+        for i in range(bisect_left(self._vocab, term), len(self._vocab)):
+            if not self._vocab[i].startswith(term):
+                break
+            matches.append(self._vocab[i])
+        return matches
+
+    def search(self, query, limit=10, prefix=True):
+        """
+        Find rows containing every term of the query, best matches first.
+
+        Each query term matches index tokens it is a prefix of (or only equal
+        tokens if prefix is False). Rows are ranked by the sum of field-weighted
+        matches times each token's inverse document frequency.
+
+        Returns:
+            list: [(score, {column: value}), ...]
+        """
+        self._ensure_loaded()
+        terms = tokenize(query)
+        if not terms:
+            return []
+        n_docs = len(self._docs)
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for token in self._expand(term, prefix):
+                postings = self._postings[token]
+                idf = log(1 + n_docs / len(postings))
+                for doc_id, weight in postings.items():
+                    term_scores[doc_id] = term_scores.get(doc_id, 0) + weight * idf
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    doc_id: score + term_scores[doc_id]
+                    for doc_id, score in scores.items()
+                    if doc_id in term_scores
+                }
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [
+            (score, dict(zip(DOC_FIELDS, self._docs[doc_id])))
+            for doc_id, score in ranked
+        ]
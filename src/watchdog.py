@@ -0,0 +1,213 @@
+from logging import info, warning
+from multiprocessing import get_context
+from time import monotonic
+
+from pdfplumber import open as pdfopen
+from psutil import NoSuchProcess, Process
+
+from src.extract import CellTextAssembler, custom_extract_tables, is_candidate_page
+
+# Retry settings for pages that blow their budget: ignoring short edges drops
+# most of the vector art and hatching that makes find_tables slow, while the
+# ruled CMC tables are still found.
+CHEAP_TABLE_SETTINGS = {
+    "edge_min_length": 20,
+    "snap_tolerance": 4,
+    "join_tolerance": 4,
+    "intersection_tolerance": 4,
+}
+
+
+def _worker(pdf_path, conn, prefilter):
+    """Extract the tables of each (page_number, table_settings, draft) request
+    sent over conn, one at a time."""
+    with pdfopen(pdf_path) as pdf:
+        conn.send(len(pdf.pages))
+        assembler = CellTextAssembler()
+        while (request := conn.recv()) is not None:
+            page_number, table_settings, draft = request
+            page = pdf.pages[page_number - 1]
+            stats = {}
+            try:
+                if prefilter and not is_candidate_page(page, stats):
+                    tables = []
+                else:
+                    tables = custom_extract_tables(
+                        page,
+                        table_settings=table_settings,
+                        stats=stats,
+                        assembler=assembler,
+                        draft=draft,
+                    )
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}", stats))
+            else:
+                conn.send(("ok", tables, stats))
+            finally:
+                page.close()
+
+
+def merge_extract_stats(total, stats):
+    """Add one page's extraction stats into a running total."""
+    for key, value in stats.items():
+        if isinstance(value, list):
+            total.setdefault(key, []).extend(value)
+        else:
+            total[key] = total.get(key, 0) + value
+
+
+class PageWatchdog:
+    """
+    Extract pages in a separate worker process under a time and memory budget.
+
+    A page that runs past `timeout` seconds, pushes the worker past
+    `max_memory_mb`, or raises is retried once with `retry_table_settings`,
+    and with the draft cell read if retry_draft is set, since per-cell layout
+    extraction can stall as well as find_tables. If that fails too the page is
+    skipped. Either way the worker is restarted when it had to be killed, so
+    one pathological page cannot stall the run.
+
+    With prefilter, pages that fail is_candidate_page() are not extracted;
+    draft is passed through to custom_extract_tables.
+
+    Outcomes are reported in the stats dict passed to pages(): "pages_retried"
+    and "pages_skipped" are lists of {"page", "reason"}, and "pages_draft"
+    lists the pages whose tables came from a draft retry.
+    """
+
+    POLL_INTERVAL = 0.1
+    START_TIMEOUT = 120
+
+    def __init__(
+        self,
+        pdf_path,
+        timeout=None,
+        max_memory_mb=None,
+        retry_table_settings=CHEAP_TABLE_SETTINGS,
+        prefilter=True,
+        draft=False,
+        retry_draft=True,
+    ):
+        self.pdf_path = pdf_path
+        self.prefilter = prefilter
+        self.draft = draft
+        self.retry_draft = retry_draft
+        self.timeout = timeout
+        self.max_memory_mb = max_memory_mb
+        self.retry_table_settings = retry_table_settings
+        self._context = get_context("spawn")
+        self._process = None
+        self._conn = None
+        self.page_count = None
+
+    def _start(self):
+        self._conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker,
+            args=(self.pdf_path, child_conn, self.prefilter),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        try:
+            if not self._conn.poll(self.START_TIMEOUT):
+                raise TimeoutError
+            self.page_count = self._conn.recv()
+        except (EOFError, TimeoutError):
+            self.close()
+            raise RuntimeError(f"Page worker failed to open '{self.pdf_path}'")
+
+    def close(self):
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+            self._process.join(1)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _kill(self):
+        self._process.kill()
+        self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def _attempt(self, page_number, table_settings, draft):
+        """Run one page in the worker; returns (status, tables_or_message, stats)."""
+        if self._process is None:
+            self._start()
+        self._conn.send((page_number, table_settings, draft))
+        worker = Process(self._process.pid)
+        start = monotonic()
+        while not self._conn.poll(self.POLL_INTERVAL):
+            if not self._process.is_alive():
+                self._kill()
+                return "crashed", "worker exited", {}
+            if self.timeout is not None and monotonic() - start > self.timeout:
+                self._kill()
+                return "timeout", f"exceeded {self.timeout} s", {}
+            if self.max_memory_mb is not None:
+                try:
+                    rss = worker.memory_info().rss / (1024 * 1024)
+                except NoSuchProcess:
+                    continue
+                if rss > self.max_memory_mb:
+                    self._kill()
+                    return "memory", f"worker RSS {rss:.0f} MB > {self.max_memory_mb} MB", {}
+        result = self._conn.recv()
+        # The budget is only checked between polls, so a page can finish after
+        # it ran out; hold it to the budget anyway.
+        elapsed = monotonic() - start
+        if self.timeout is not None and elapsed > self.timeout:
+            return "timeout", f"took {elapsed:.2f} s > {self.timeout} s", {}
+        return result
+
+    def extract(self, page_number, stats):
+        """Extract one page's tables, retrying or skipping it if it blows the budget.
+
+        Returns:
+            list: The page's tables, or [] if the page was skipped.
+        """
+        status, result, page_stats = self._attempt(page_number, None, self.draft)
+        retry_draft = self.draft or self.retry_draft
+        if status != "ok" and self.retry_table_settings is not None:
+            warning(f"Page {page_number}: {status} ({result}), retrying with cheaper settings")
+            stats.setdefault("pages_retried", []).append(
+                {"page": page_number, "reason": f"{status}: {result}"}
+            )
+            status, result, page_stats = self._attempt(
+                page_number, self.retry_table_settings, retry_draft
+            )
+            if status == "ok" and retry_draft and not self.draft:
+                warning(f"Page {page_number}: extracted with the draft cell read")
+                stats.setdefault("pages_draft", []).append(page_number)
+        merge_extract_stats(stats, page_stats)
+        if status != "ok":
+            warning(f"Page {page_number}: {status} ({result}), skipping page")
+            stats.setdefault("pages_skipped", []).append(
+                {"page": page_number, "reason": f"{status}: {result}"}
+            )
+            return []
+        return result
+
+    def pages(self, stats):
+        """Yield (page_number, page_count, tables) for every page of the PDF."""
+        if self._process is None:
+            self._start()
+        info(f"Extracting {self.page_count} pages in an isolated worker")
+        for page_number in range(1, self.page_count + 1):
+            yield page_number, self.page_count, self.extract(page_number, stats)
@@ -1,5 +1,5 @@
 import pytest
-from src.cmc import parse_budget, budget
+from src.cmc import parse_budget, parse_budget_columns, budget
 
 
 @pytest.mark.parametrize(
@@ -23,3 +23,16 @@ from src.cmc import parse_budget, budget
 )
 def test_parse_cmc(input_text, expected):
     assert parse_budget(input_text) == expected
+
+
+def test_parse_budget_columns():
+    texts = ["(36 + 2.3D) µin", "27 µin", "0.019 % rdg", "---"]
+    columns = parse_budget_columns(texts)
+    assert [budget(*row) for row in zip(*columns)] == [parse_budget(t) for t in texts]
+
+
+def test_budget_is_slotted():
+    b = budget(36, 2.3, "D", "µin")
+    assert not hasattr(b, "__dict__")
+    assert list(b) == [36, 2.3, "D", "µin"]
+    assert repr(b) == "budget(36, 2.3, 'D', 'µin')"
@@ -0,0 +1,153 @@
+import json
+import os
+import sys
+import pytest
+import pandas as pd
+from math import inf, isnan, nan
+import src.cmcindex
+from src.cmcindex import CmcIndex, CmcLookup, evaluate_cmc, write_cmc_index
+from src.main import custom_parse_table, parse_table_rows
+
+
+@pytest.fixture
+def scope():
+    columns = ["Equipment", "Parameter", "Range", "Frequency", "CMC (±)", "Comments"]
+    rows = [
+        ["Micrometers", "", "Up to 12 in", "", "(36 + 2.3D) µin", ""],
+        ["Micrometers", "", "(12 to 24) in", "", "(59 + 2.5D) µin", ""],
+        ["DC Current", "Measure", "100 mA to 1 A", "", "0.03 % + 20 µA", ""],
+        ["Hardness", "HRC", "> 60 HRC", "", "0.5 HRC", ""],
+        ["Placeholder", "", "---", "", "27 µin", ""],
+    ]
+    return parse_table_rows(pd.DataFrame(rows, columns=columns).values.tolist())
+
+
+def test_lookup(scope, tmp_path):
+    path = tmp_path / "scope.cmcidx"
+    write_cmc_index(scope, path)
+    with CmcIndex(path) as index:
+        [hit] = index.lookup("Micrometers", "", 5, "in")
+        assert hit["row"] == 0 and hit["range"] == "Up to 12 in"
+        assert (hit["cmc_base"], hit["cmc_multiplier"]) == (36.0, 2.3)
+        assert hit["cmc_mult_unit"] == "in" and hit["cmc_uncertainty_unit"] == "µin"
+        # Shared bound matches both rows, in range order.
+        assert [h["row"] for h in index.lookup("Micrometers", "", 12, "in")] == [0, 1]
+        assert index.lookup("Micrometers", "", 25, "in") == []
+        assert index.lookup("Micrometers", "", 5, "mm") == []
+        # Mixed units are indexed under each unit, open on the other side.
+        assert [h["row"] for h in index.lookup("DC Current", "Measure", 500, "mA")] == [2]
+        assert [h["row"] for h in index.lookup("DC Current", "Measure", 0.5, "A")] == [2]
+        # Open-ended ranges.
+        assert index.lookup("Hardness", "HRC", 59, "HRC") == []
+        assert [h["row"] for h in index.lookup("Hardness", "HRC", 70, "HRC")] == [3]
+        [placeholder] = index.lookup("Placeholder", "", 0, "---")
+        assert placeholder["cmc_base"] == 27.0
+
+
+def test_columns_round_trip(tmp_path):
+    with open("tests/test_data/pages/page7.json", encoding="utf-8-sig") as f:
+        tables = json.load(f)
+    df = parse_table_rows([row for table in tables for row in custom_parse_table(table)])
+    path = tmp_path / "page7.cmcidx"
+    write_cmc_index(df, path)
+    with CmcIndex(path) as index:
+        assert index.n_entries >= len(df)
+        rows = sorted(set(index._row))
+        assert rows == list(range(len(df)))
+        for i in range(index.n_entries):
+            assert index._range_min[i] <= index._range_max[i] or index._range_max[i] == inf
+            row = df.iloc[index._row[i]]
+            assert index.string(index._cmc[i]) == row["CMC (±)"]
+            assert isnan(index._cmc_multiplier[i]) or index._cmc_multiplier[i] == row["cmc_multiplier"]
+
+
+def test_failed_write_keeps_old_index(scope, tmp_path, monkeypatch):
+    path = tmp_path / "scope.cmcidx"
+    write_cmc_index(scope, path)
+    before = path.read_bytes()
+
+    def refuse(src, dst):
+        raise PermissionError("file is mapped")
+
+    monkeypatch.setattr(src.cmcindex, "replace", refuse)
+    with pytest.raises(PermissionError):
+        write_cmc_index(scope.iloc[:1], path)
+    assert path.read_bytes() == before
+    assert [p.name for p in tmp_path.iterdir()] == ["scope.cmcidx"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permission bits")
+def test_index_file_mode(scope, tmp_path):
+    """The index gets the same mode as a plain file, or keeps the one it replaces."""
+    plain = tmp_path / "scope.csv"
+    plain.write_text("")
+    path = tmp_path / "scope.cmcidx"
+    write_cmc_index(scope, path)
+    assert os.stat(path).st_mode & 0o777 == os.stat(plain).st_mode & 0o777
+    os.chmod(path, 0o640)
+    write_cmc_index(scope, path)
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Windows cannot replace a mapped file")
+def test_rewrite_under_open_reader(scope, tmp_path):
+    path = tmp_path / "scope.cmcidx"
+    write_cmc_index(scope, path)
+    with CmcIndex(path) as old:
+        write_cmc_index(scope.iloc[:1], path)
+        # The open mapping still sees the complete old revision.
+        assert old.n_entries > 1
+        assert [h["row"] for h in old.lookup("Micrometers", "", 12, "in")] == [0, 1]
+        with CmcIndex(path) as new:
+            assert new.n_entries == 1
+
+
+def test_cached_lookup_and_evaluate(scope, tmp_path):
+    path = tmp_path / "scope.cmcidx"
+    write_cmc_index(scope, path)
+    with CmcLookup(path, maxsize=2) as lookup:
+        assert lookup.evaluate("Micrometers", "", 10, "in") == ((0, 36 + 2.3 * 10, "µin"),)
+        assert lookup.evaluate("Micrometers", "", 10, "in") == ((0, 36 + 2.3 * 10, "µin"),)
+        info = lookup.cache_info()
+        assert (info["evaluate"].hits, info["evaluate"].misses) == (1, 1)
+        # Percent of reading in another unit can't be evaluated without conversion.
+        assert lookup.evaluate("DC Current", "Measure", 0.5, "A") == ((2, None, "µA"),)
+        lookup.lookup("Micrometers", "", 1, "in")
+        lookup.lookup("Micrometers", "", 2, "in")
+        assert lookup.cache_info()["lookup"].currsize == 2  # bounded
+
+        # Loading a newer revision written to a new path invalidates the cache.
+        newer = scope.copy()
+        newer.loc[0, "cmc_base"] = 30.0
+        newer_path = tmp_path / "scope-2.cmcidx"
+        write_cmc_index(newer, newer_path)
+        lookup.load(newer_path)
+        assert lookup.evaluate("Micrometers", "", 10, "in") == ((0, 30 + 2.3 * 10, "µin"),)
+        assert lookup.cache_info()["revision"] == 2
+        assert lookup.cache_info()["evaluate"].hits == 0
+
+        # Releasing the mapping lets the file be rewritten, even on Windows;
+        # the next query reopens it.
+        lookup.close()
+        newer.loc[0, "cmc_base"] = 20.0
+        write_cmc_index(newer, newer_path)
+        assert lookup.evaluate("Micrometers", "", 10, "in") == ((0, 20 + 2.3 * 10, "µin"),)
+        assert lookup.cache_info()["revision"] == 3
+
+
+@pytest.mark.parametrize(
+    "entry, value, unit, expected",
+    [
+        ({"cmc_base": 36.0, "cmc_multiplier": 2.3, "cmc_mult_unit": "in", "cmc_uncertainty_unit": "µin"}, 2, "in", 40.6),
+        ({"cmc_base": 27.0, "cmc_multiplier": 0.0, "cmc_mult_unit": None, "cmc_uncertainty_unit": "µin"}, 2, "in", 27.0),
+        ({"cmc_base": 0.0, "cmc_multiplier": 0.5, "cmc_mult_unit": "% rdg", "cmc_uncertainty_unit": None}, 200, "psi", 1.0),
+        ({"cmc_base": 3.6, "cmc_multiplier": 0.034, "cmc_mult_unit": "%", "cmc_uncertainty_unit": "µV"}, 1, "V", None),
+        ({"cmc_base": nan, "cmc_multiplier": nan, "cmc_mult_unit": None, "cmc_uncertainty_unit": None}, 1, "V", None),
+    ],
+)
+def test_evaluate_cmc(entry, value, unit, expected):
+    result = evaluate_cmc(entry, value, unit)
+    if expected is None:
+        assert result is None
+    else:
+        assert result == pytest.approx(expected)
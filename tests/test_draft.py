@@ -0,0 +1,47 @@
+import pandas as pd
+import pdfplumber
+from benchmarks.draft import row_diff
+from src.extract import custom_extract_tables
+from src.main import custom_parse_table, pdf_table_processor
+
+
+def test_draft_mode():
+    """Draft extraction keeps the table shape and is labelled as draft."""
+    with pdfplumber.open("tests/test_data/pages/page1.pdf") as pdf:
+        page = pdf.pages[0]
+        full = custom_extract_tables(page)
+        draft = custom_extract_tables(page, draft=True)
+    assert [len(row) for row in draft[0]] == [len(row) for row in full[0]]
+    header_texts = [[item["text"] for item in cell] for cell in full[0][0]]
+    assert [[item["text"] for item in cell] for cell in draft[0][0]] == header_texts
+    assert len(custom_parse_table(draft[0])) == len(custom_parse_table(full[0]))
+
+    df = pdf_table_processor("tests/test_data/pages/page1.pdf", draft=True)
+    assert df.attrs["draft"] is True
+    assert pdf_table_processor("tests/test_data/pages/page1.pdf").attrs["draft"] is False
+
+
+def test_draft_keeps_small_type_cells():
+    """A cell set entirely in small type is kept, as in full mode."""
+    with pdfplumber.open("tests/test_data/pages/page1.pdf") as pdf:
+        page = pdf.pages[0]
+        cell = page.find_tables()[0].rows[1].cells[0]
+        x0, top, x1, bottom = cell
+        for char in page.chars:
+            if x0 <= char["x0"] and char["x1"] <= x1 and top <= char["top"] and char["bottom"] <= bottom:
+                char["size"] = 6.0
+        [table] = custom_extract_tables(page, draft=True)
+    assert any(item["text"] for item in table[1][0])
+
+
+def test_draft_row_diff():
+    """row_diff lines up rows and lists the ones that changed."""
+    columns = ["Equipment", "Parameter", "Range", "Frequency", "CMC (±)", "Comments"]
+    full = pd.DataFrame([["A", "p", "1 in", "", "2 µin", ""], ["B", "q", "2 in", "", "3 µin", "x"]], columns=columns)
+    draft = full.copy()
+    draft.loc[1, "Comments"] = "y"
+    summary, diff = row_diff(full, draft)
+    assert summary["matching_rows"] == 1 and summary["draft_rows"] == 2
+    assert summary["column_matches"]["Equipment"] == 2
+    assert summary["column_matches"]["Comments"] == 1
+    assert [tag for tag, _ in diff] == ["-", "+"]
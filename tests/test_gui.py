@@ -0,0 +1,25 @@
+import pytest
+from src.gui import ProcessingCancelled, ProgressWindow, format_eta
+
+
+def finished_window(result=None, error=None):
+    """A ProgressWindow whose job has finished, without opening a Tk window."""
+    window = ProgressWindow.__new__(ProgressWindow)
+    window.result = result
+    window.error = error
+    return window
+
+
+def test_format_eta():
+    assert format_eta(0) == "0:00"
+    assert format_eta(125.4) == "2:05"
+
+
+def test_outcome_after_cancel():
+    """Only a job that raised ProcessingCancelled counts as cancelled."""
+    assert finished_window(error=ProcessingCancelled())._outcome() is None
+    # Cancel pressed after the last page: the finished result is kept.
+    assert finished_window(result="df")._outcome() == "df"
+    # A real failure is not hidden by a cancel.
+    with pytest.raises(MemoryError):
+        finished_window(error=MemoryError("boom"))._outcome()
@@ -1,6 +1,9 @@
 import pytest
-from src.main import custom_parse_table, pdf_table_processor
-from src.extract import custom_extract_tables
+import time
+from threading import Event
+from src.main import custom_parse_table, parse_table_rows, pdf_table_processor, ProcessingCancelled
+from src.extract import CellTextAssembler, custom_extract_tables, is_candidate_page, table_header
+from src.memory import MemoryCeilingExceeded, RssSampler
 import pdfplumber
 import json
 from deepdiff import DeepDiff
@@ -109,4 +112,127 @@ def test_whole_files(pdf_file):
     for index, row in table.iterrows():
         assert not row.isnull().all(), f"Row {index} is empty"
 
-    pass
\ No newline at end of file
+
+def test_bounded_memory_mode():
+    """Bounded-memory mode yields the same rows and reports memory per page."""
+    pdf_file = "tests/test_data/pages/page20.pdf"
+    expected = pdf_table_processor(pdf_file)
+    table = pdf_table_processor(pdf_file, bounded_memory=True)
+    pd.testing.assert_frame_equal(expected, table)
+    stats = table.attrs["page_stats"]
+    assert [s["page"] for s in stats] == [1]
+    assert all(s["peak_rss_mb"] > 0 and s["rss_mb"] > 0 for s in stats)
+
+
+def test_rss_sampler_is_per_block():
+    """Each block reports its own peak, not the process high-water mark."""
+    with RssSampler() as heavy:
+        block = b"x" * (200 * 1024 * 1024)
+        time.sleep(0.05)
+        del block
+    with RssSampler() as light:
+        time.sleep(0.05)
+    assert heavy.peak_mb - light.peak_mb > 100
+
+
+def test_rss_ceiling():
+    """A ceiling below the current RSS aborts the run."""
+    with pytest.raises(MemoryCeilingExceeded):
+        pdf_table_processor("tests/test_data/pages/page20.pdf", max_rss_mb=1)
+
+
+def test_progress_and_cancel():
+    """Progress is reported per page, and a set cancel event stops the run."""
+    pdf_file = "tests/test_data/pages/page20.pdf"
+    updates = []
+    table = pdf_table_processor(pdf_file, progress=lambda *a: updates.append(a))
+    assert updates == [(1, 1, len(table))]
+
+    cancel = Event()
+    cancel.set()
+    with pytest.raises(ProcessingCancelled):
+        pdf_table_processor(pdf_file, cancel=cancel)
+
+
+def test_unsupported_tables_are_skipped():
+    """Tables without a known first header are skipped and reported in stats."""
+    with pdfplumber.open("tests/test_data/pages/page1.pdf") as pdf:
+        page = pdf.pages[0]
+        stats = {}
+        assert len(custom_extract_tables(page, stats=stats)) == 1
+        assert stats["tables_extracted"] == 1 and stats["tables_skipped"] == []
+
+        # Cropping off the header row leaves a table that starts mid-scope.
+        header_row = page.find_tables()[0].rows[0]
+        cropped = page.crop((0, header_row.bbox[3] - 1, page.width, page.height))
+        stats = {}
+        assert custom_extract_tables(cropped, stats=stats) == []
+        assert stats["tables_extracted"] == 0
+        assert len(stats["tables_skipped"]) == 1
+
+
+def test_header_footnote_marker():
+    """A superscript footnote marker on the header does not get the table skipped."""
+    with pdfplumber.open("tests/test_data/pages/page1.pdf") as pdf:
+        page = pdf.pages[0]
+        table = page.find_tables()[0]
+        last = [c for c in page.crop(table.rows[0].cells[0]).chars if c["text"] != " "][-1]
+        assert last["text"] == "t"
+        marker = dict(last, text="1", size=6.0, x0=last["x1"], x1=last["x1"] + 3)
+        marker["bottom"] = marker["top"] + 3
+        page.objects["char"].append(marker)
+        assert table_header(page, table) == "Parameter/Equipment"
+        assert len(custom_extract_tables(page)) == 1
+
+
+def test_page_prefilter():
+    """Pages without ruled tables or a known header never reach find_tables."""
+    stats = {}
+    with pdfplumber.open("tests/test_data/2820-01.pdf") as pdf:
+        assert is_candidate_page(pdf.pages[0], stats)
+        assert not is_candidate_page(pdf.pages[-1], stats)
+    assert stats["pages_prefiltered"][0]["page"] == 26
+
+    df = pdf_table_processor("tests/test_data/2820-01.pdf")
+    assert [p["page"] for p in df.attrs["extract_stats"]["pages_prefiltered"]] == [25, 26]
+    unfiltered = pdf_table_processor("tests/test_data/2820-01.pdf", prefilter_pages=False)
+    pd.testing.assert_frame_equal(df, unfiltered)
+
+
+def test_placeholder_mult_units(caplog):
+    """D/L/W multiplier units take the range unit; mixed-unit ranges warn once."""
+    rows = [
+        ["E", "P", "1 in to 2 in", "---", "(36 + 2.3D) µin", ""],
+        ["E", "P", "1 mm to 2 in", "---", "(7.8 + 3.8L) µin", ""],
+        ["E", "P", "1 mm to 2 in", "---", "(7.8 + 3.8W) µin", ""],
+        ["E", "P", "1 in to 2 in", "---", "0.019 % rdg", ""],
+    ]
+    with caplog.at_level("WARNING"):
+        df = parse_table_rows(rows)
+    assert df["cmc_mult_unit"].tolist() == ["in", "mm", "mm", "% rdg"]
+    assert df["cmc_multiplier"].dtype == "float64"
+    warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert len(warnings) == 1 and "'L', 'W'" in warnings[0] and "2 rows" in warnings[0]
+
+
+def test_cell_text_assembler_reuse():
+    """One assembler reused across pages gives the same tables as fresh ones."""
+    assembler = CellTextAssembler()
+    assert assembler.convert_to_subscript("l0") == "ₗ₀"
+    assert assembler.is_subscript_candidate("H2") and not assembler.is_subscript_candidate("H2O")
+    for pdf_file in ["page1.pdf", "page20.pdf", "page21.pdf"]:
+        with pdfplumber.open(f"tests/test_data/pages/{pdf_file}") as pdf:
+            page = pdf.pages[0]
+            assert custom_extract_tables(page, assembler=assembler) == custom_extract_tables(page)
+
+
+def test_cell_text_assembler_recovers_from_failed_cell():
+    """A cell that raises leaves nothing behind for the next call."""
+    assembler = CellTextAssembler()
+    # More text than chars makes remove_small_chars run off the end.
+    broken = [{"text": "ab", "chars": [{"text": "a", "size": 10, "y1": 0}], "top": 0, "x0": 0, "x1": 5}]
+    with pytest.raises(IndexError):
+        assembler.assemble(broken, (0, 0, 100, 20), 0)
+    with pdfplumber.open("tests/test_data/pages/page1.pdf") as pdf:
+        page = pdf.pages[0]
+        assert custom_extract_tables(page, assembler=assembler) == custom_extract_tables(page)
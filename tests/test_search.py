@@ -0,0 +1,57 @@
+import pytest
+import pandas as pd
+from src.search import ScopeIndex, tokenize
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Thread Plug Gages", ["thread", "plug", "gages"]),
+        ("Pressure (0 to 30) in·H₂O", ["pressure", "0", "to", "30", "in·h₂o"]),
+        ("4.4 µV/V", ["4.4", "µv/v"]),
+        ("0.034 % rdg", ["0.034", "%", "rdg"]),
+        ("(-112 °F to 32) °F", ["112", "°f", "to", "32", "°f"]),
+        (None, []),
+    ],
+)
+def test_tokenize(text, expected):
+    assert tokenize(text) == expected
+
+
+@pytest.fixture
+def scope():
+    columns = ["Equipment", "Parameter", "Range", "Frequency", "CMC (±)", "Comments"]
+    rows = [
+        ["Micrometers", "", "Up to 12 in", "", "(36 + 2.3D) µin", "Gage blocks"],
+        ["Thread Plug Gages", "Pitch Diameter", "Up to 8 in", "", "(59 + 2.5D) µin", "Thread wires"],
+        ["HP 3458A", "AC Voltage – Measure", "(1 to 10) V", "(10 to 40) Hz", "0.03 % + 20 µV", ""],
+        ["Fluke 5502A", "DC Voltage – Generate", "(1 to 10) V", "", "4.6 µV/V + 1.1 µV", "Micrometer check"],
+    ]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def test_search_ranked_and_prefix(scope):
+    index = ScopeIndex()
+    index.add(scope, source="rev A")
+    results = index.search("micrometer")
+    # A prefix match in Equipment outranks one in Comments.
+    assert [row["Equipment"] for _, row in results] == ["Micrometers", "Fluke 5502A"]
+    assert results[0][1]["source"] == "rev A"
+    assert index.search("micrometer", prefix=False) == results[1:]
+    assert [row["Equipment"] for _, row in index.search("thread plug")] == ["Thread Plug Gages"]
+    assert [row["Parameter"] for _, row in index.search("ac voltage")] == ["AC Voltage – Measure"]
+    assert index.search("thread voltage") == []
+
+
+def test_save_and_lazy_open(scope, tmp_path):
+    index = ScopeIndex()
+    index.add(scope, source="rev A")
+    path = tmp_path / "scope_index.json"
+    index.save(path)
+
+    reopened = ScopeIndex.open(path)
+    assert reopened._path == path  # nothing read yet
+    assert reopened.search("voltage") == index.search("voltage")
+    reopened.add(scope, source="rev B")
+    assert len(reopened) == 8
+    assert {row["source"] for _, row in reopened.search("micrometers")} == {"rev A", "rev B"}
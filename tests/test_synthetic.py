@@ -0,0 +1,27 @@
+import pytest
+from benchmarks.synthetic import generate_pages, generate_table
+from src.main import custom_parse_table, parse_table_rows
+
+
+@pytest.mark.parametrize("header", ["Parameter/Equipment", "Parameter/Range"])
+@pytest.mark.parametrize("n_rows", [1, 9, 250])
+def test_generate_table_row_count(header, n_rows):
+    """custom_parse_table yields exactly the rows the generator promises."""
+    for seed in range(5):
+        table, expected = generate_table(n_rows, header, seed=seed)
+        assert table[0][0][0]["text"] == header
+        assert expected == n_rows
+        assert len(custom_parse_table(table)) == n_rows
+
+
+def test_generate_pages_through_pipeline():
+    """Synthetic pages run through every parse stage."""
+    pages, expected = generate_pages(500, rows_per_page=40)
+    table_rows = [row for page in pages for table in page for row in custom_parse_table(table)]
+    df = parse_table_rows(table_rows)
+    assert len(df) == expected == 500
+    assert set(df["Equipment"]) and not df["CMC (±)"].eq("").any()
+    texts = [item["text"] for page in pages for row in page[0] for cell in row for item in cell]
+    assert any(text.endswith("(cont)") for text in texts)
+    assert any(text.startswith("\t") for text in texts)
+    assert any("₂" in text or "ₗ" in text for text in texts)
@@ -0,0 +1,63 @@
+import pandas as pd
+import pdfplumber
+import pytest
+from src.extract import custom_extract_tables
+from src.main import pdf_table_processor
+from src.watchdog import CHEAP_TABLE_SETTINGS, PageWatchdog
+
+PDF_FILE = "tests/test_data/pages/page20.pdf"
+
+
+def test_watchdog_matches_in_process():
+    """Extracting through the watchdog's worker gives the same rows."""
+    expected = pdf_table_processor(PDF_FILE)
+    table = pdf_table_processor(PDF_FILE, page_timeout=120, page_memory_mb=2048)
+    pd.testing.assert_frame_equal(expected, table)
+    stats = table.attrs["extract_stats"]
+    assert stats["tables_extracted"] == expected.attrs["extract_stats"]["tables_extracted"]
+    assert "pages_skipped" not in stats
+
+
+def test_watchdog_skips_page_over_budget():
+    """A page over its time budget is retried once, then skipped and reported.
+
+    A result that arrives after the budget ran out counts as a timeout too, so
+    this does not depend on how fast the page extracts.
+    """
+    table = pdf_table_processor(PDF_FILE, page_timeout=0.001)
+    assert table.empty
+    assert table.columns.tolist()[:6] == ["Equipment", "Parameter", "Range", "Frequency", "CMC (±)", "Comments"]
+    stats = table.attrs["extract_stats"]
+    assert [p["page"] for p in stats["pages_retried"]] == [1]
+    assert [p["page"] for p in stats["pages_skipped"]] == [1]
+    assert stats["pages_skipped"][0]["reason"].startswith("timeout")
+
+
+def test_watchdog_rejects_in_process_memory_options():
+    """The in-process memory options are not silently ignored under the watchdog."""
+    with pytest.raises(ValueError):
+        pdf_table_processor(PDF_FILE, page_timeout=60, max_rss_mb=4096)
+    with pytest.raises(ValueError):
+        pdf_table_processor(PDF_FILE, page_memory_mb=2048, bounded_memory=True)
+
+
+def test_watchdog_retries_with_draft_cell_read():
+    """The retry switches to the draft cell read, not just cheaper table settings."""
+    requests = []
+
+    class FlakyWatchdog(PageWatchdog):
+        def _attempt(self, page_number, table_settings, draft):
+            requests.append((table_settings, draft))
+            if len(requests) == 1:
+                return "timeout", "exceeded 1 s", {}
+            return super()._attempt(page_number, table_settings, draft)
+
+    stats = {}
+    with FlakyWatchdog(PDF_FILE, timeout=120) as watchdog:
+        tables = watchdog.extract(1, stats)
+    assert requests == [(None, False), (CHEAP_TABLE_SETTINGS, True)]
+    assert stats["pages_draft"] == [1]
+    with pdfplumber.open(PDF_FILE) as pdf:
+        assert tables == custom_extract_tables(
+            pdf.pages[0], table_settings=CHEAP_TABLE_SETTINGS, draft=True
+        )